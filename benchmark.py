@@ -0,0 +1,954 @@
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from arclet.alconna import Alconna, Args, CommandMeta, Option, Subcommand, command_manager
+from arclet.alconna.exceptions import OutBoundsBehave
+from src.arclet.alconna.tools import (
+    AlconnaDecorate,
+    AlconnaFormat,
+    AlconnaString,
+    ObjectPattern,
+    SpecCache,
+    cool_down,
+    delegate,
+    simple_type,
+)
+from src.arclet.alconna.tools.construct import args_from_list, clear_args_cache, parse_command_spec, parse_node_spec
+from src.arclet.alconna.tools.debug import analyse_args, analyse_option, prepare
+
+
+def bench(name: str, func, number: int = 50000):
+    func()
+    st = time.perf_counter()
+    for _ in range(number):
+        func()
+    ed = time.perf_counter()
+    print(f"{name:<36} {number / (ed - st):>12.2f} op/s  {(ed - st) / number * 1e6:>8.3f} us/op")
+    return number / (ed - st)
+
+
+def bench_object_pattern():
+    class User:
+        def __init__(self, username: str, userid: int, level: float = 1.0):
+            self.name = username
+            self.id = userid
+            self.level = level
+
+    pat = ObjectPattern(User, flag="urlget")
+    text = "username=abcd&userid=123&level=2.5"
+
+    def legacy():
+        mat = pat._re_pattern.fullmatch(text)
+        return User(**analyse_args(pat._args, list(mat.groupdict().values()), raise_exception=False))
+
+    print("ObjectPattern.match")
+    old = bench("  analyse_args (legacy)", legacy)
+    new = bench("  compiled fields", lambda: pat.match(text))
+    print(f"  speedup: {new / old:.2f}x")
+
+
+def bench_prepared():
+    args = Args["foo", int]["bar", str]
+    opt = Option("--foo", Args["bar", int]["baz", str])
+    prepared_args = prepare(args)
+    prepared_opt = prepare(opt)
+
+    print("debug.analyse_args")
+    old = bench("  analyse_args", lambda: analyse_args(args, ["123", "abc"]))
+    new = bench("  prepare(args)", lambda: prepared_args(["123", "abc"]))
+    print(f"  speedup: {new / old:.2f}x")
+    print("debug.analyse_option")
+    old = bench("  analyse_option", lambda: analyse_option(opt, ["--foo", "123", "abc"]))
+    new = bench("  prepare(option)", lambda: prepared_opt(["--foo", "123", "abc"]))
+    print(f"  speedup: {new / old:.2f}x")
+
+
+def bench_executor_batch():
+    cli = AlconnaDecorate()
+
+    @cli.command("bench_batch")
+    @cli.option("--foo", Args["bar", int])
+    def handler(bar: int):
+        return bar
+
+    messages = [f"bench_batch --foo {i}" for i in range(1000)]
+
+    def loop():
+        for msg in messages:
+            handler(msg)
+
+    print("Executor, 1000 messages")
+    old = bench("  for-loop over __call__", loop, 50)
+    new = bench("  Executor.batch", lambda: handler.batch(messages), 50)
+    print(f"  speedup: {new / old:.2f}x")
+
+
+def bench_startup():
+    def build(types=None):
+        for i in range(1000):
+            alc = (
+                AlconnaString(f"bench_startup_{i} <target:str> <count:int=1> #help", types=types)
+                .option("foo", "-f <val:bool> [bar:int]")
+                .option("--baz -b <baz:str+>")
+                .subcommand("qux <a:float>")
+                .build()
+            )
+            command_manager.delete(alc)
+
+    def cold():
+        clear_args_cache()
+        build()
+
+    specs = [
+        [["target", "str"], ["count", "int", "1"], ["val", "bool"], ["bar;?", "int"], ["baz", "str+"], ["a", "float"]]
+        for _ in range(1000)
+    ]
+    types = globals()
+
+    def args_cold():
+        for spec in specs:
+            clear_args_cache()
+            args_from_list(spec, types)
+
+    def args_warm():
+        for spec in specs:
+            args_from_list(spec, types)
+
+    print("args_from_list, 1000 specs")
+    old = bench("  cold args cache", args_cold, 10)
+    new = bench("  warm args cache", args_warm, 10)
+    print(f"  speedup: {new / old:.2f}x")
+    print("AlconnaString, build 1000 commands")
+    old = bench("  cold args cache", cold, 3)
+    new = bench("  warm args cache", build, 3)
+    print(f"  speedup: {new / old:.2f}x")
+    bench("  warm args cache, types={}", lambda: build({}), 3)
+
+
+def bench_grammar():
+    commands = [f"[!|/]bench_grammar_{i} <target:str> <count:int=1> [extra:List[int]] #help" for i in range(1000)]
+    nodes = [f"--opt{i} -o{i} <val:bool> [bar:int] #help" for i in range(1000)]
+
+    def parse():
+        for cmd, node in zip(commands, nodes):
+            parse_command_spec(cmd)
+            parse_node_spec(node)
+
+    def cold():
+        parse_command_spec.cache_clear()
+        parse_node_spec.cache_clear()
+        parse()
+
+    print("koishi-like grammar, 1000 commands + 1000 options")
+    old = bench("  cold spec cache", cold, 20)
+    new = bench("  warm spec cache", parse, 20)
+    print(f"  speedup: {new / old:.2f}x")
+
+
+def bench_spec_cache():
+    import tempfile
+    from pathlib import Path
+
+    def factory(i):
+        return lambda: (
+            AlconnaString(f"bench_spec_{i} <target:str> <count:int=1> #help")
+            .option("foo", "-f <val:bool> [bar:int]")
+            .option("--baz -b <baz:str+>")
+            .subcommand("qux <a:float>")
+        )
+
+    def clear():
+        clear_args_cache()
+        parse_command_spec.cache_clear()
+        parse_node_spec.cache_clear()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "commands.json")
+        cache = SpecCache(path)
+        for i in range(1000):
+            cache.string(f"bench_spec_{i}", factory(i), i)
+        cache.save()
+
+        def from_string():
+            clear()
+            for i in range(1000):
+                command_manager.delete(factory(i)().build())
+
+        def from_cache():
+            clear()
+            loaded = SpecCache(path)
+            for i in range(1000):
+                command_manager.delete(loaded.string(f"bench_spec_{i}", factory(i), i).build())
+
+        print("SpecCache, cold build of 1000 commands")
+        old = bench("  from strings", from_string, 3)
+        new = bench("  from cached specs", from_cache, 3)
+        print(f"  speedup: {new / old:.2f}x")
+
+
+def bench_lazy_mount():
+    import tracemalloc
+    from types import ModuleType
+
+    from src.arclet.alconna.tools.construct import ModuleMounter
+
+    lines = ['"""bench service"""']
+    for i in range(200):
+        lines.append(f"def func_{i}(a: int, b: str = 'x', c: float = 1.0):\n    return a\n")
+    for j in range(20):
+        methods = "".join(f"    def m_{k}(self, x: int, y: str = 'y'):\n        return x\n" for k in range(10))
+        lines.append(f"class Cls{j}:\n    def __init__(self, v: int = 0):\n        self.v = v\n{methods}")
+    module = ModuleType("bench_service")
+    exec("\n".join(lines), module.__dict__)
+
+    def mount(lazy: bool):
+        alc = ModuleMounter(module, lazy=lazy)
+        alc.parse("bench_service func_3 1")
+        command_manager.delete(alc)
+
+    print("ModuleMounter, 200 functions + 20 classes, mount and parse once")
+    old = bench("  eager", lambda: mount(False), 10)
+    new = bench("  lazy", lambda: mount(True), 10)
+    print(f"  speedup: {new / old:.2f}x")
+    for lazy in (False, True):
+        tracemalloc.start()
+        alc = ModuleMounter(module, lazy=lazy)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        command_manager.delete(alc)
+        print(f"  {'lazy' if lazy else 'eager':<34} {current / 1024:>10.1f} KiB retained {peak / 1024:>10.1f} KiB peak")
+
+
+def bench_callback_dispatch():
+    from src.arclet.alconna.tools.construct import ClassMounter
+
+    namespace = {}
+    methods = "".join(f"    def m_{k}(self, x: int):\n        return x\n" for k in range(200))
+    exec(f"class BenchDispatch:\n    def __init__(self, v: int = 0):\n        self.v = v\n{methods}", namespace)
+    alc = ClassMounter(namespace["BenchDispatch"])
+    handler = alc.cb_behavior
+    arp = alc.parse("BenchDispatch m_5 1")
+
+    def legacy():
+        if call := handler.main_call:
+            call(**arp.main_args)
+        for path, action in handler.options.items():
+            if (d := arp.query(path, None)) is not None:
+                handler.results[action.__qualname__] = action(**d)
+
+    print("CallbackHandler.operate, 200 methods, 1 matched")
+    old = bench("  query every path (legacy)", legacy, 2000)
+    new = bench("  dest index", lambda: handler.operate(arp), 2000)
+    print(f"  speedup: {new / old:.2f}x")
+    command_manager.delete(alc)
+
+
+def bench_simple_type():
+    def plain(a: int, b: str, c: float = 1.0):
+        return a
+
+    parsed = simple_type(compiled=False)(plain)
+    compiled = simple_type()(plain)
+    assert parsed(1, "b") == compiled(1, "b") == 1
+
+    print("simple_type call, 3 params")
+    bench("  plain call", lambda: plain(1, "b"), 200000)
+    old = bench("  full parse (compiled=False)", lambda: parsed(1, "b"), 20000)
+    new = bench("  compiled validation", lambda: compiled(1, "b"), 200000)
+    print(f"  speedup: {new / old:.2f}x")
+
+
+def bench_simple_type_memory(count: int = 10000):
+    from arclet.alconna import config
+
+    def make(i):
+        def func(*nums: int):
+            return i
+
+        return func
+
+    def legacy(func):
+        _cmd = Alconna(f"{id(func)}", Args.from_callable(func)[0], meta=CommandMeta(raise_exception=False))
+        return _cmd, func
+
+    print(f"simple_type, {count} decorated functions")
+    for label, deco in (("  Alconna per function (legacy)", legacy), ("  unregistered validators", simple_type())):
+        funcs = [make(i) for i in range(count)]
+        max_count = config.command_max_count
+        config.command_max_count = max_count + count
+        tracemalloc.start()
+        st = time.perf_counter()
+        wrapped = [deco(func) for func in funcs]
+        ed = time.perf_counter()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label:<36} {current / 1024 / 1024:>9.2f} MiB  {ed - st:>8.3f} s  commands: {command_manager.current_count}")
+        for item in wrapped:
+            if isinstance(item, tuple):
+                command_manager.delete(item[0])
+        config.command_max_count = max_count
+        del wrapped
+
+
+def bench_cool_down(count: int = 200000):
+    from dataclasses import dataclass, field
+    from datetime import datetime
+
+    from arclet.alconna.arparma import ArparmaBehavior
+
+    @dataclass(unsafe_hash=True)
+    class LegacyCoolDown(ArparmaBehavior):
+        last_time: datetime = field(default_factory=lambda: datetime.now())
+
+        def operate(self, interface):
+            current_time = datetime.now()
+            if (current_time - self.last_time).total_seconds() < 0:
+                raise OutBoundsBehave()
+            else:
+                self.last_time = current_time
+
+    print("cool_down.operate")
+    old = bench("  datetime, global (legacy)", _behavior_case(LegacyCoolDown()), 200000)
+    new = bench("  monotonic, global", _behavior_case(cool_down(0)), 200000)
+    print(f"  speedup: {new / old:.2f}x")
+    bench("  monotonic, per user", _behavior_case(cool_down(60, scope="user", max_keys=4096)), 200000)
+    alc = Alconna("bench_behavior", Args["bar", int])
+    arp = alc.parse("bench_behavior 1")
+    command_manager.delete(alc)
+    users = [f"user{i}" for i in range(count)]
+    for max_keys in (4096, count):
+        behavior = cool_down(60, scope="user", max_keys=max_keys)
+        tracemalloc.start()
+        for user in users:
+            arp.context["user"] = user
+            behavior.operate(arp)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {count} users, max_keys={max_keys:<8} {current / 1024:>10.1f} KiB  keys: {len(behavior.expires)}")
+
+
+def bench_constraints():
+    from src.arclet.alconna.tools import constraints, exclusion, inclusion
+
+    names = [f"opt{i}" for i in range(8)]
+    alc = Alconna("bench_rules", *(Option(name) for name in names))
+    arp = alc.parse("bench_rules opt0 opt2 opt5")
+    command_manager.delete(alc)
+    pairs = [(f"options.{names[i]}", f"options.{names[i + 1]}") for i in range(0, 8, 2)]
+    targets = [f"options.{name}" for name in names]
+
+    def legacy():
+        for left, right in pairs:
+            if arp.query(left) and arp.query(right):
+                raise OutBoundsBehave()
+        if len(targets) - sum(1 for target in targets if arp.query(target)) > 8:
+            raise OutBoundsBehave()
+
+    stacked = [exclusion(left, right) for left, right in pairs] + [inclusion(*targets)]
+    combined = constraints(exclude=pairs, include_any=[targets])
+
+    def run_stacked():
+        for behavior in stacked:
+            behavior.operate(arp)
+
+    print("exclusion x4 + inclusion(any) over 8 paths")
+    old = bench("  Arparma.query (legacy)", legacy, 50000)
+    new = bench("  compiled paths, stacked", run_stacked, 50000)
+    bench("  constraints(), one pass", lambda: combined.operate(arp), 50000)
+    print(f"  speedup: {new / old:.2f}x")
+
+
+def bench_constraint_set():
+    from src.arclet.alconna.tools import constraint_set, exclusion, inclusion
+
+    names = [f"opt{i}" for i in range(32)]
+    alc = Alconna("bench_cset", *(Option(name) for name in names))
+    arp = alc.parse("bench_cset opt0 opt1 opt3 opt9 opt20")
+    conflicts = [(names[i], names[i + 16]) for i in range(16)]
+    requires = [(names[i], names[i + 1]) for i in range(0, 32, 2)]
+    groups = [names[i:i + 4] for i in range(0, 32, 4)]
+
+    stacked = [exclusion(f"options.{a}", f"options.{b}") for a, b in conflicts]
+    # inclusion 没有 "存在时才要求" 的语义, 这里只比较每条规则一次查询的开销
+    stacked += [inclusion(f"options.{a}", f"options.{b}") for a, b in requires]
+    stacked += [inclusion(*(f"options.{name}" for name in group)) for group in groups]
+    combined = constraint_set(requires=requires, conflicts=conflicts, at_most=[(2, group) for group in groups])
+
+    def run_stacked():
+        for behavior in stacked:
+            try:
+                behavior.operate(arp)
+            except OutBoundsBehave:
+                pass
+
+    def run_combined():
+        try:
+            combined.operate(arp)
+        except OutBoundsBehave:
+            pass
+
+    print(f"32 options, {len(stacked)} rules, 2 violated")
+    old = bench("  one behavior per rule", run_stacked, 20000)
+    new = bench("  constraint_set bitmasks", run_combined, 20000)
+    print(f"  speedup: {new / old:.2f}x")
+    arp = alc.parse("bench_cset opt0 opt1 opt9")
+    command_manager.delete(alc)
+    print(f"32 options, {len(stacked)} rules, none violated")
+    old = bench("  one behavior per rule", run_stacked, 20000)
+    new = bench("  constraint_set bitmasks", run_combined, 20000)
+    print(f"  speedup: {new / old:.2f}x")
+
+
+def bench_formatter_layout(count: int = 300):
+    import shutil
+
+    from arclet.alconna.base import Completion, Shortcut
+    from src.arclet.alconna.tools import ShellTextFormatter
+
+    class LegacyShell(ShellTextFormatter):
+        def body(self, parts):
+            options = []
+            width = shutil.get_terminal_size(fallback=(80, 24)).columns
+            for opt in (i for i in parts if isinstance(i, Option) and not isinstance(i, (Completion, Shortcut))):
+                name = (f'{{{" ".join(opt.requires)}}} ' if opt.requires else "") + ", ".join(sorted(opt.aliases, key=len))
+                text = f"  {name}{tuple(opt.separators)[0]}{self.parameters(opt.args, show_notice=False)}"
+                help_text = opt.help_text
+                if len(help_text) + 24 > width:
+                    _prts = [help_text[i:i + (width - 24)] for i in range(0, len(help_text), width - 24)]
+                    help_text = f"\n{' ' * 24}".join(_prts)
+                if len(text) > 22:
+                    text += f"\n{' ' * 24}{help_text}"
+                else:
+                    text += f"{' ' * (24 - len(text))}{help_text}"
+                options.append(text)
+            option_string = "\n".join(options)
+            return f"Options:\n{option_string}\n" if option_string else ""
+
+    def build(formatter_type):
+        return Alconna(
+            "bench_layout",
+            *(Option(f"--opt{i}", Args["v", int], help_text=f"option {i} " * 10) for i in range(count)),
+            formatter_type=formatter_type,
+        )
+
+    print(f"ShellTextFormatter.body, {count} options, cache cleared")
+    results = []
+    for label, formatter_type in (("  per-call chunking body (legacy)", LegacyShell), ("  layout engine", ShellTextFormatter)):
+        alc = build(formatter_type)
+
+        def run():
+            alc.formatter.cache_clear()
+            return alc.formatter.format_node()
+
+        results.append(bench(label, run, 200))
+        command_manager.delete(alc)
+    print(f"  speedup: {results[1] / results[0]:.2f}x")
+
+
+def _config_target(name="world"):
+    class Config:
+        command = "bench_config"
+        description = "benchmark"
+        prefixes = ["!", "/"]
+
+    return name
+
+
+def bench_visit_config():
+    import inspect
+    import re
+
+    from src.arclet.alconna.tools.construct import config_keys, visit_config
+
+    def legacy():
+        result = {}
+        codes, _ = inspect.getsourcelines(_config_target)
+        _get_config = False
+        _start_indent = 0
+        for line in codes:
+            indent = len(line) - len(line.lstrip())
+            if line.lstrip().startswith("class") and line.lstrip().rstrip("\n").endswith("Config:"):
+                _get_config = True
+                _start_indent = indent
+                continue
+            if _get_config:
+                if indent == _start_indent:
+                    break
+                _contents = re.split(r"\s*=\s*", line.strip())
+                if len(_contents) == 2 and _contents[0] in config_keys:
+                    result[_contents[0]] = eval(_contents[1])
+        return result
+
+    print("visit_config on a function")
+    old = bench("  getsourcelines + eval (legacy)", legacy, 5000)
+    new = bench("  cached AST", lambda: visit_config(_config_target), 5000)
+    print(f"  speedup: {new / old:.2f}x")
+
+
+# ---------------------------------------------------------------------------
+# suite: machine-readable results and run comparison
+# ---------------------------------------------------------------------------
+
+CASES: Dict[str, Tuple[Callable[[], Callable[[], Any]], int]] = {}
+
+
+def case(name: str, number: int = 10000):
+    """注册一个基准用例, 被装饰的函数负责准备数据并返回被测的无参函数"""
+    def wrapper(setup: Callable[[], Callable[[], Any]]):
+        CASES[name] = (setup, number)
+        return setup
+
+    return wrapper
+
+
+def measure(func: Callable[[], Any], number: int) -> Dict[str, float]:
+    for _ in range(min(number // 10 + 1, 200)):
+        func()
+    timer = time.perf_counter_ns
+    samples = []
+    for _ in range(number):
+        st = timer()
+        func()
+        samples.append(timer() - st)
+    total = sum(samples)
+    samples.sort()
+    tracemalloc.start()
+    for _ in range(min(number, 50)):
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "number": number,
+        "ops": number / total * 1e9,
+        "mean_us": total / number / 1e3,
+        "p50_us": samples[number // 2] / 1e3,
+        "p99_us": samples[min(number - 1, int(number * 0.99))] / 1e3,
+        "peak_kib": peak / 1024,
+    }
+
+
+def _cycle(template: str, count: int = 256):
+    # 数量超过 Alconna 的消息缓存 (128), 避免测到缓存命中
+    messages = itertools.cycle([template.format(i=i) for i in range(count)])
+    return lambda: next(messages)
+
+
+def _built(factory: Callable[[], Any]):
+    def run():
+        command_manager.delete(factory())
+
+    return run
+
+
+def _string_command():
+    return (
+        AlconnaString("bench_string <target:str> <count:int=1> #help")
+        .option("foo", "-f <val:bool> [bar:int]")
+        .option("--baz -b <baz:str+>")
+        .subcommand("qux <a:float>")
+        .build()
+    )
+
+
+@case("construct.string.build", 500)
+def _():
+    return _built(_string_command)
+
+
+@case("construct.string.parse")
+def _():
+    alc = _string_command()
+    message = _cycle("bench_string abc {i} -f true qux 1.5")
+    return lambda: alc.parse(message())
+
+
+def _format_command():
+    return AlconnaFormat("bench_format user {target} perm set {key} {default}", {"default": Args["default", bool, True]})
+
+
+@case("construct.format.build", 500)
+def _():
+    return _built(_format_command)
+
+
+@case("construct.format.parse")
+def _():
+    alc = _format_command()
+    message = _cycle("bench_format user u{i} perm set key.{i} False")
+    return lambda: alc.parse(message())
+
+
+def bench_fire_func(name: str, count: int = 1):
+    """benchmark target"""
+    return name * count
+
+
+class BenchFire:
+    """benchmark target"""
+
+    def __init__(self, sender: str = "bench"):
+        self.sender = sender
+
+    def talk(self, name: str = "world"):
+        return f"{name} from {self.sender}"
+
+    def count(self, a: int, b: int = 1):
+        return a + b
+
+    class Sub:
+        def __init__(self, value: int = 0):
+            self.value = value
+
+        def show(self):
+            return self.value
+
+
+def _fire_module():
+    from types import ModuleType
+
+    module = ModuleType("bench_fire_module")
+    source = "".join(f"def func_{i}(a: int, b: str = 'x'):\n    return a\n" for i in range(50))
+    source += "".join(
+        f"class Cls{j}:\n    def __init__(self, v: int = 0):\n        self.v = v\n"
+        + "".join(f"    def m_{k}(self, x: int):\n        return x\n" for k in range(5))
+        for j in range(5)
+    )
+    exec(source, module.__dict__)
+    return module
+
+
+@case("construct.fire.func.build", 500)
+def _():
+    from src.arclet.alconna.tools.construct import FuncMounter
+
+    return _built(lambda: FuncMounter(bench_fire_func))
+
+
+@case("construct.fire.func.parse")
+def _():
+    from src.arclet.alconna.tools.construct import FuncMounter
+
+    alc = FuncMounter(bench_fire_func)
+    message = _cycle("bench_fire_func n{i} 2")
+    return lambda: alc.parse(message())
+
+
+@case("construct.fire.class.build", 500)
+def _():
+    from src.arclet.alconna.tools.construct import ClassMounter
+
+    return _built(lambda: ClassMounter(BenchFire))
+
+
+@case("construct.fire.class.parse")
+def _():
+    from src.arclet.alconna.tools.construct import ClassMounter
+
+    alc = ClassMounter(BenchFire)
+    message = _cycle("BenchFire s{i} count {i} 2 Sub 3 show")
+    return lambda: alc.parse(message())
+
+
+@case("construct.fire.object.build", 500)
+def _():
+    from src.arclet.alconna.tools.construct import ObjectMounter
+
+    obj = BenchFire()
+    return _built(lambda: ObjectMounter(obj))
+
+
+@case("construct.fire.object.parse")
+def _():
+    from src.arclet.alconna.tools.construct import ObjectMounter
+
+    alc = ObjectMounter(BenchFire())
+    message = _cycle("BenchFire talk n{i}")
+    return lambda: alc.parse(message())
+
+
+@case("construct.fire.module.build", 50)
+def _():
+    from src.arclet.alconna.tools.construct import ModuleMounter
+
+    module = _fire_module()
+    return _built(lambda: ModuleMounter(module))
+
+
+@case("construct.fire.module_lazy.build", 500)
+def _():
+    from src.arclet.alconna.tools.construct import ModuleMounter
+
+    module = _fire_module()
+    return _built(lambda: ModuleMounter(module, lazy=True))
+
+
+@case("construct.fire.module.parse")
+def _():
+    from src.arclet.alconna.tools.construct import ModuleMounter
+
+    alc = ModuleMounter(_fire_module())
+    message = _cycle("bench_fire_module func_7 {i}")
+    return lambda: alc.parse(message())
+
+
+def _decorate_command():
+    cli = AlconnaDecorate()
+
+    @cli.command("bench_decorate")
+    @cli.option("--foo", Args["bar", int])
+    @cli.option("--baz", Args["qux", str])
+    def handler(bar: int = 0, qux: str = ""):
+        return bar
+
+    return handler
+
+
+@case("construct.decorate.build", 500)
+def _():
+    return _built(lambda: _decorate_command().command)
+
+
+@case("construct.decorate.parse")
+def _():
+    handler = _decorate_command()
+    message = _cycle("bench_decorate --foo {i} --baz abc")
+    return lambda: handler(message())
+
+
+class BenchDelegate:
+    """benchmark target"""
+    prefix = "!"
+    main_args = Args["target", str]
+    foo = Option("--foo", Args["bar", int])
+    sub = Subcommand("sub", Args["value", float])
+
+
+@case("construct.delegate.build", 500)
+def _():
+    return _built(lambda: delegate(BenchDelegate))
+
+
+@case("construct.delegate.parse")
+def _():
+    alc = delegate(BenchDelegate)
+    message = _cycle("!BenchDelegate t{i} --foo {i} sub 1.5")
+    return lambda: alc.parse(message())
+
+
+class BenchUser:
+    def __init__(self, username: str, userid: int, level: float = 1.0):
+        self.name = username
+        self.id = userid
+        self.level = level
+
+
+_OBJECT_INPUTS = {
+    "part": "abcd;123;2.5",
+    "space": "abcd 123 2.5",
+    "urlget": "username=abcd&userid=123&level=2.5",
+    "json": "{'username':'abcd','userid':'123','level':'2.5'}",
+}
+
+for _flag, _text in _OBJECT_INPUTS.items():
+    def _object_case(flag=_flag, text=_text):
+        pat = ObjectPattern(BenchUser, flag=flag)
+        return lambda: pat.match(text)
+
+    case(f"pattern.object.{_flag}.match", 20000)(_object_case)
+
+
+def _plain(a: int, b: str, c: float = 1.0):
+    return a
+
+
+@case("checker.baseline.call", 50000)
+def _():
+    return lambda: _plain(1, "b", c=2.0)
+
+
+@case("checker.simple_type.call")
+def _():
+    checked = simple_type()(_plain)
+    return lambda: checked(1, "b", c=2.0)
+
+
+def _behavior_case(behavior, context_key: str = "user", count: int = 100000):
+    # 直接对同一个 Arparma 调用 operate, 只测行为器本身
+    alc = Alconna("bench_behavior", Args["bar", int])
+    arp = alc.parse("bench_behavior 1")
+    command_manager.delete(alc)
+    keys = itertools.cycle(range(count))
+
+    def run():
+        arp.context[context_key] = next(keys)
+        try:
+            behavior.operate(arp)
+        except OutBoundsBehave:
+            pass
+
+    return run
+
+
+@case("actions.cool_down.operate", 50000)
+def _():
+    return _behavior_case(cool_down(60, scope="user", max_keys=4096))
+
+
+@case("actions.token_bucket.operate", 50000)
+def _():
+    from src.arclet.alconna.tools import token_bucket
+
+    return _behavior_case(token_bucket(10, 60, burst=3, scope="user"))
+
+
+@case("actions.sliding_window.operate", 50000)
+def _():
+    from src.arclet.alconna.tools import sliding_window
+
+    return _behavior_case(sliding_window(10, 60, scope="user"))
+
+
+def _formatted(formatter_type):
+    return Alconna(
+        "bench_help", ["!"], Args["foo#abcd", int],
+        Option("--foo", Args["bar;?", str], help_text="foo option"),
+        Option("aaa baz|bar|baf"),
+        Option("aaa bbb fire"),
+        Subcommand(
+            "qux",
+            Args["a"],
+            Option("aaa"),
+            Option("bbb", Args["ccc#ddd", bool]["eee#fff", str]),
+        ),
+        formatter_type=formatter_type,
+        meta=CommandMeta("bench description", "bench usage", "bench example"),
+    )
+
+
+for _formatter in ("ShellTextFormatter", "MarkdownTextFormatter", "RichTextFormatter", "RichConsoleFormatter"):
+    def _formatter_case(name=_formatter):
+        from src.arclet.alconna.tools import formatter
+
+        alc = _formatted(getattr(formatter, name))
+        return alc.formatter.format_node
+
+    def _formatter_cold_case(name=_formatter):
+        from src.arclet.alconna.tools import formatter
+
+        alc = _formatted(getattr(formatter, name))
+
+        def run():
+            alc.formatter.cache_clear()
+            return alc.formatter.format_node()
+
+        return run
+
+    case(f"formatter.{_formatter}.format", 5000)(_formatter_case)
+    case(f"formatter.{_formatter}.format.cold", 5000)(_formatter_cold_case)
+
+
+def _package_version(name: str) -> Optional[str]:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def run_suite(pattern: Optional[str] = None, scale: float = 1.0) -> Dict[str, Any]:
+    results = {}
+    print(f"{'case':<40} {'op/s':>12} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>10}")
+    for name, (setup, number) in CASES.items():
+        if pattern and pattern not in name:
+            continue
+        res = results[name] = measure(setup(), max(int(number * scale), 10))
+        print(f"{name:<40} {res['ops']:>12.1f} {res['p50_us']:>10.2f} {res['p99_us']:>10.2f} {res['peak_kib']:>10.1f}")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "arclet-alconna": _package_version("arclet-alconna"),
+            "nepattern": _package_version("nepattern"),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any], threshold: float = 0.1) -> List[str]:
+    """比较两次运行的结果, 打印各项变化并返回吞吐下降或 p99 上升超过阈值的用例"""
+    regressions = []
+    print(f"{'case':<40} {'base op/s':>12} {'head op/s':>12} {'op/s':>8} {'p99':>8} {'peak':>8}")
+    for name, old in base["results"].items():
+        if (new := head["results"].get(name)) is None:
+            print(f"{name:<40} {old['ops']:>12.1f} {'-':>12}")
+            continue
+        ops = new["ops"] / old["ops"] - 1
+        p99 = new["p99_us"] / old["p99_us"] - 1 if old["p99_us"] else 0.0
+        peak = new["peak_kib"] / old["peak_kib"] - 1 if old["peak_kib"] else 0.0
+        mark = ""
+        if ops < -threshold or p99 > threshold * 2:
+            regressions.append(name)
+            mark = "  <- regression"
+        print(f"{name:<40} {old['ops']:>12.1f} {new['ops']:>12.1f} {ops:>+8.1%} {p99:>+8.1%} {peak:>+8.1%}{mark}")
+    for name in head["results"].keys() - base["results"].keys():
+        print(f"{name:<40} {'-':>12} {head['results'][name]['ops']:>12.1f}")
+    return regressions
+
+
+def legacy():
+    bench_object_pattern()
+    bench_prepared()
+    bench_executor_batch()
+    bench_startup()
+    bench_grammar()
+    bench_spec_cache()
+    bench_lazy_mount()
+    bench_visit_config()
+    bench_callback_dispatch()
+    bench_simple_type()
+    bench_simple_type_memory()
+    bench_cool_down()
+    bench_constraints()
+    bench_constraint_set()
+    bench_formatter_layout()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Alconna-Tools benchmark suite")
+    commands = parser.add_subparsers(dest="command")
+    run = commands.add_parser("run", help="run the suite")
+    run.add_argument("-o", "--output", help="write results as JSON to this file")
+    run.add_argument("-k", "--filter", help="only run cases whose name contains this string")
+    run.add_argument("--scale", type=float, default=1.0, help="scale the iteration count of every case")
+    cmp = commands.add_parser("compare", help="compare two JSON results")
+    cmp.add_argument("base")
+    cmp.add_argument("head")
+    cmp.add_argument("--threshold", type=float, default=0.1, help="relative op/s drop reported as regression")
+    commands.add_parser("legacy", help="compare optimized paths against their previous implementation")
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.head, encoding="utf-8") as f:
+            head = json.load(f)
+        return 1 if compare(base, head, args.threshold) else 0
+    if args.command == "legacy":
+        legacy()
+        return 0
+    data = run_suite(getattr(args, "filter", None), getattr(args, "scale", 1.0))
+    if output := getattr(args, "output", None):
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,10 @@ from .construct import AlconnaFormat as AlconnaFormat
 from .construct import AlconnaString as AlconnaString
 from .construct import Argument as Argument
 from .construct import Executor as Executor
+from .construct import PoolParser as PoolParser
+from .construct import AsyncExecutor as AsyncExecutor
+from .construct import SpecCache as SpecCache
+from .construct import MountResult as MountResult
 from .construct import alconna_from_format as alconna_from_format
 from .construct import alconna_from_object as alconna_from_object
 from .construct import delegate as delegate
@@ -13,6 +17,14 @@ from .checker import simple_type as simple_type
 from .actions import exclusion as exclusion
 from .actions import cool_down as cool_down
 from .actions import inclusion as inclusion
+from .actions import constraints as constraints
+from .actions import constraint_set as constraint_set
+from .actions import ConstraintViolation as ConstraintViolation
+from .actions import token_bucket as token_bucket
+from .actions import sliding_window as sliding_window
+from .actions import RateLimitStore as RateLimitStore
+from .actions import MemoryStore as MemoryStore
+from .actions import SQLiteStore as SQLiteStore
 from .formatter import ShellTextFormatter as ShellTextFormatter
 from .formatter import MarkdownTextFormatter as MarkdownTextFormatter
 from .formatter import RichTextFormatter as RichTextFormatter
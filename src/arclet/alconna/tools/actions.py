@@ -1,13 +1,62 @@
 """Alconna ArgAction相关"""
 
-from datetime import datetime
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock, local
+from time import monotonic, time
 from tarina import lang
-from typing import Literal
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Literal, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from arclet.alconna.exceptions import OutBoundsBehave
 from arclet.alconna.arparma import Arparma, ArparmaBehavior
 
 
+_RESERVED = {"options", "subcommands", "main_args", "other_args", "context", "args"}
+_ARGS_SOURCES = {"$main": "main_args", "main_args": "main_args", "$other": "other_args", "other_args": "other_args"}
+
+
+@lru_cache(4096)
+def compile_path(path: str) -> Callable[[Arparma], Any]:
+    """
+    将查询路径预编译为访问函数, 结果同 `Arparma.query(path)`
+
+    常见的 `foo`, `options.foo[.value|.args|.args.bar|.bar]`, `subcommands.foo[.value|.args|.args.bar]`
+    与 `$main.foo` 形式会在此时解析完毕; 其余依赖解析结果才能确定含义的路径回退到 `Arparma.query`
+
+    Args:
+        path: 查询路径
+    """
+    parts = path.split(".")
+    head = parts[0]
+    if len(parts) == 1 and head not in _RESERVED:
+        def find(interface: Arparma):
+            for src in (interface.main_args, interface.other_args, interface.options, interface.subcommands, interface.context):
+                if head in src:
+                    return src[head]
+            return None
+
+        return find
+    if head in _ARGS_SOURCES and len(parts) == 2:
+        attr, key = _ARGS_SOURCES[head], parts[1]
+        return lambda interface: getattr(interface, attr).get(key)
+    if head in ("options", "subcommands") and len(parts) > 1:
+        name, rest = parts[1], parts[2:]
+        if not rest:
+            return lambda interface: getattr(interface, head).get(name)
+        if rest == ["value"]:
+            return lambda interface: None if (res := getattr(interface, head).get(name)) is None else res.value
+        if rest == ["args"]:
+            return lambda interface: None if (res := getattr(interface, head).get(name)) is None else res.args
+        if (len(rest) == 2 and rest[0] == "args") or (len(rest) == 1 and head == "options"):
+            key = rest[-1]
+            return lambda interface: None if (res := getattr(interface, head).get(name)) is None else res.args.get(key)
+    return lambda interface: interface.query(path)
+
+
 def exclusion(target_path: str, other_path: str):
     """
     当设置的两个路径同时存在时, 抛出异常
@@ -16,10 +65,11 @@ def exclusion(target_path: str, other_path: str):
         target_path: 目标路径
         other_path: 其他路径
     """
+    target, other = compile_path(target_path), compile_path(other_path)
 
     class _EXCLUSION(ArparmaBehavior):
         def operate(self, interface: "Arparma"):
-            if interface.query(target_path) and interface.query(other_path):
+            if target(interface) and other(interface):
                 raise OutBoundsBehave(
                     lang.require("tools", "actions.exclusion").format(left=target_path, right=other_path)
                 )
@@ -27,28 +77,250 @@ def exclusion(target_path: str, other_path: str):
     return _EXCLUSION()
 
 
-def cool_down(seconds: float):
+_INF = float("inf")
+
+Scope = Union[str, Callable[[Arparma], Hashable], None]
+"""限流的作用域: None 表示整个命令共用, 字符串表示取 `Arparma.context` 中对应的值, 也可以传入从 `Arparma` 中提取键的函数"""
+
+
+def _scope_key(scope: Scope) -> Callable[[Arparma], Hashable]:
+    if scope is None:
+        return lambda _: None
+    if isinstance(scope, str):
+        return lambda interface: interface.context.get(scope)
+    return scope
+
+
+def cool_down(seconds: float, scope: Scope = None, max_keys: int = 65536):
     """
     当设置的时间间隔内被调用时, 抛出异常
 
     Args:
         seconds: 时间间隔
+        scope: 冷却的作用域, 例如 "user" 表示按 `Arparma.context["user"]` 分别冷却; 默认为整个命令共用
+        max_keys: 最多记录的键数量, 超出时淘汰最早到期的键
     """
+    get_key = _scope_key(scope)
 
-    @dataclass(unsafe_hash=True)
+    @dataclass(eq=False)
     class _CoolDown(ArparmaBehavior):
-        last_time: datetime = field(default_factory=lambda: datetime.now())
+        # 每个键的到期时间; 间隔固定, 因此插入顺序即到期顺序, 过期的键总在队首
+        expires: "OrderedDict[Hashable, float]" = field(default_factory=OrderedDict, repr=False)
+        sweep_at: float = field(default=_INF, repr=False)
+        lock: Lock = field(default_factory=Lock, repr=False)
+
+        def sweep(self, now: float):
+            """淘汰所有已过期的键, 并在超出容量时淘汰最早到期的键"""
+            expires = self.expires
+            while expires:
+                key, expire = next(iter(expires.items()))
+                if expire > now and len(expires) < max_keys:
+                    self.sweep_at = expire
+                    return
+                del expires[key]
+            self.sweep_at = _INF
 
         def operate(self, interface: "Arparma"):
-            current_time = datetime.now()
-            if (current_time - self.last_time).total_seconds() < seconds:
-                raise OutBoundsBehave(lang.require("tools", "actions.cooldown"))
-            else:
-                self.last_time = current_time
+            key = get_key(interface)
+            expires = self.expires
+            with self.lock:
+                now = monotonic()
+                expire = expires.get(key)
+                if expire is not None:
+                    if now < expire:
+                        raise OutBoundsBehave(lang.require("tools", "actions.cooldown"))
+                    del expires[key]
+                if now >= self.sweep_at or len(expires) >= max_keys:
+                    self.sweep(now)
+                expires[key] = expire = now + seconds
+                if self.sweep_at is _INF:
+                    self.sweep_at = expire
 
     return _CoolDown()
 
 
+State = Tuple[float, ...]
+Step = Callable[[float, Optional[State]], Tuple[bool, State]]
+
+
+class RateLimitStore(ABC):
+    """
+    限流状态的存储后端
+
+    `update` 需要原子地读取一个键的状态, 交由 `step` 根据当前时间计算是否放行与新的状态, 再写回新的状态;
+    状态为由数值组成的元组, 键为 (限流器名称, 作用域键) 组成的元组
+    """
+
+    def now(self) -> float:
+        """返回计算状态所用的时间, 需要在共享同一存储的所有进程间一致"""
+        return monotonic()
+
+    @abstractmethod
+    def update(self, key: Tuple[str, Hashable], step: Step, ttl: float) -> bool:
+        """
+        原子地更新一个键的状态, 返回是否放行
+
+        Args:
+            key: 状态的键
+            step: 由当前时间与旧状态 (不存在时为 None) 计算是否放行与新状态的函数
+            ttl: 状态在最后一次更新后经过 ttl 秒即与初始状态等价, 此后存储可以将其删除
+        """
+
+
+class MemoryStore(RateLimitStore):
+    """进程内的限流状态存储, 超出容量时淘汰最久未使用的键 (即重置其限流状态)"""
+
+    def __init__(self, max_keys: int = 65536):
+        self.max_keys = max_keys
+        self.states: "OrderedDict[Tuple[str, Hashable], State]" = OrderedDict()
+        self.lock = Lock()
+
+    def update(self, key: Tuple[str, Hashable], step: Step, ttl: float) -> bool:
+        states = self.states
+        with self.lock:
+            allowed, state = step(monotonic(), states.get(key))
+            states[key] = state
+            states.move_to_end(key)
+            if len(states) > self.max_keys:
+                states.popitem(last=False)
+        return allowed
+
+
+class SQLiteStore(RateLimitStore):
+    """
+    基于 SQLite 文件的限流状态存储, 可被同一台机器上的多个进程共享
+
+    每隔 sweep_interval 秒在更新时删除已过期的行;
+    数据库被锁定超过 timeout 秒或无法访问时, 该次调用视为被限流, 以 OutBoundsBehave 的形式返回解析失败
+    """
+
+    def __init__(self, path: Union[str, Path], timeout: float = 5.0, sweep_interval: float = 60.0):
+        self.path = str(path)
+        self.timeout = timeout
+        self.sweep_interval = sweep_interval
+        self.sweep_at = 0.0
+        self.local = local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit (key TEXT PRIMARY KEY, state TEXT NOT NULL, expire REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if (conn := getattr(self.local, "conn", None)) is None:
+            conn = self.local.conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        return conn
+
+    def now(self) -> float:
+        return time()
+
+    def update(self, key: Tuple[str, Hashable], step: Step, ttl: float) -> bool:
+        conn = self._connect()
+        name = repr(key)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = self.now()
+                if now >= self.sweep_at:
+                    self.sweep_at = now + self.sweep_interval
+                    conn.execute("DELETE FROM rate_limit WHERE expire < ?", (now,))
+                row = conn.execute("SELECT state FROM rate_limit WHERE key = ?", (name,)).fetchone()
+                allowed, state = step(now, tuple(json.loads(row[0])) if row else None)
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_limit (key, state, expire) VALUES (?, ?, ?)",
+                    (name, json.dumps(state), now + ttl),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        except sqlite3.OperationalError as e:
+            raise OutBoundsBehave(lang.require("tools", "actions.rate_limit_unavailable")) from e
+        return allowed
+
+
+def _rate_limit(name: str, step: Step, ttl: float, scope: Scope, store: Optional[RateLimitStore]):
+    get_key = _scope_key(scope)
+    _store = store or MemoryStore()
+
+    class _RateLimit(ArparmaBehavior):
+        store = _store
+
+        def operate(self, interface: "Arparma"):
+            if not _store.update((name, get_key(interface)), step, ttl):
+                raise OutBoundsBehave(lang.require("tools", "actions.rate_limit"))
+
+    return _RateLimit()
+
+
+def token_bucket(
+    limit: int,
+    period: float,
+    burst: Optional[int] = None,
+    scope: Scope = None,
+    store: Optional[RateLimitStore] = None,
+    name: Optional[str] = None,
+):
+    """
+    令牌桶限流: 每 period 秒补充 limit 个令牌, 桶中最多存放 burst 个令牌, 每次调用消耗一个令牌, 令牌不足时抛出异常
+
+    Args:
+        limit: 每个周期补充的令牌数
+        period: 周期, 单位为秒
+        burst: 桶的容量, 即允许的突发调用次数, 默认与 limit 相同
+        scope: 限流的作用域, 同 `cool_down`
+        store: 状态存储后端, 默认为进程内的 `MemoryStore`
+        name: 状态在存储中的名称, 多个限流器共享同一存储时用于区分, 默认由参数生成
+    """
+    capacity = float(burst or limit)
+    rate = limit / period
+
+    def step(now: float, state: Optional[State]) -> Tuple[bool, State]:
+        if state is None:
+            tokens = capacity
+        else:
+            tokens = min(capacity, state[0] + (now - state[1]) * rate)
+        if tokens >= 1:
+            return True, (tokens - 1, now)
+        return False, (tokens, now)
+
+    return _rate_limit(name or f"token_bucket:{limit}/{period}/{capacity}", step, capacity / rate, scope, store)
+
+
+def sliding_window(
+    limit: int,
+    period: float,
+    scope: Scope = None,
+    store: Optional[RateLimitStore] = None,
+    name: Optional[str] = None,
+):
+    """
+    滑动窗口限流: 任意 period 秒内最多允许 limit 次调用, 超出时抛出异常
+
+    以当前与上一个固定窗口的计数加权估计滑动窗口内的调用次数, 每个键只需保存三个数值
+
+    Args:
+        limit: 窗口内允许的调用次数
+        period: 窗口长度, 单位为秒
+        scope: 限流的作用域, 同 `cool_down`
+        store: 状态存储后端, 默认为进程内的 `MemoryStore`
+        name: 状态在存储中的名称, 多个限流器共享同一存储时用于区分, 默认由参数生成
+    """
+
+    def step(now: float, state: Optional[State]) -> Tuple[bool, State]:
+        index = now // period
+        if state is None or index > state[0] + 1:
+            current, previous = 0.0, 0.0
+        elif index > state[0]:
+            current, previous = 0.0, state[1]
+        else:
+            current, previous = state[1], state[2]
+        if previous * (index + 1 - now / period) + current + 1 > limit:
+            return False, (index, current, previous)
+        return True, (index, current + 1, previous)
+
+    return _rate_limit(name or f"sliding_window:{limit}/{period}", step, 2 * period, scope, store)
+
+
 def inclusion(*targets: str, flag: Literal["any", "all"] = "any"):
     """
     当设置的路径不存在时, 抛出异常
@@ -57,15 +329,160 @@ def inclusion(*targets: str, flag: Literal["any", "all"] = "any"):
         targets: 路径列表
         flag: 匹配方式, 可选值为"any"或"all", 默认为"any"
     """
+    getters = [(target, compile_path(target)) for target in targets]
 
     class _Inclusion(ArparmaBehavior):
         def operate(self, interface: "Arparma"):
             if flag == "all":
-                for target in targets:
-                    if not interface.query(target):
+                for target, getter in getters:
+                    if not getter(interface):
                         raise OutBoundsBehave(lang.require("tools", "actions.inclusion").format(target=target))
-            else:
-                all_count = len(targets) - sum(1 for target in targets if interface.query(target))
-                if all_count > 0:
-                    raise OutBoundsBehave(lang.require("tools", "actions.inclusion"))
+            elif not any(getter(interface) for _, getter in getters):
+                raise OutBoundsBehave(lang.require("tools", "actions.inclusion").format(target=" | ".join(targets)))
+
     return _Inclusion()
+
+
+def constraints(
+    exclude: Iterable[Tuple[str, str]] = (),
+    include: Iterable[str] = (),
+    include_any: Iterable[Iterable[str]] = (),
+):
+    """
+    将多条 `exclusion` 与 `inclusion` 规则合并为一个行为器, 每次解析时每个路径至多查询一次
+
+    Args:
+        exclude: 不能同时存在的路径对, 同 `exclusion`
+        include: 必须存在的路径, 同 `inclusion(..., flag="all")`
+        include_any: 至少需要存在其一的路径组, 同 `inclusion(..., flag="any")`
+    """
+    paths: Dict[str, int] = {}
+
+    def index(path: str) -> int:
+        return paths.setdefault(path, len(paths))
+
+    excludes = [(index(left), index(right), left, right) for left, right in exclude]
+    includes = [(index(path), path) for path in include]
+    includes_any = [([index(path) for path in group], " | ".join(group)) for group in map(tuple, include_any)]
+    getters = [compile_path(path) for path in paths]
+
+    def check(found: List[Optional[bool]], i: int, interface: Arparma) -> bool:
+        if (res := found[i]) is None:
+            res = found[i] = bool(getters[i](interface))
+        return res
+
+    class _Constraints(ArparmaBehavior):
+        def operate(self, interface: "Arparma"):
+            # 路径在首次被规则用到时才查询, 结果在本次解析内复用
+            found: List[Optional[bool]] = [None] * len(getters)
+            for left, right, left_path, right_path in excludes:
+                if check(found, left, interface) and check(found, right, interface):
+                    raise OutBoundsBehave(
+                        lang.require("tools", "actions.exclusion").format(left=left_path, right=right_path)
+                    )
+            for i, path in includes:
+                if not check(found, i, interface):
+                    raise OutBoundsBehave(lang.require("tools", "actions.inclusion").format(target=path))
+            for group, target in includes_any:
+                if not any(check(found, i, interface) for i in group):
+                    raise OutBoundsBehave(lang.require("tools", "actions.inclusion").format(target=target))
+
+    return _Constraints()
+
+
+class ConstraintViolation(OutBoundsBehave):
+    """解析结果违反了 `constraint_set` 中的规则, `violations` 为所有违反规则的提示"""
+
+    def __init__(self, violations: List[str]):
+        super().__init__("\n".join(violations))
+        self.violations = violations
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def constraint_set(
+    requires: Iterable[Tuple[str, Union[str, Iterable[str]]]] = (),
+    conflicts: Iterable[Tuple[str, Union[str, Iterable[str]]]] = (),
+    at_most: Iterable[Tuple[int, Iterable[str]]] = (),
+    exactly_one: Iterable[Iterable[str]] = (),
+):
+    """
+    声明选项与子命令之间的约束, 编译为位掩码后统一检查, 并在一个异常中报告所有违反的规则
+
+    规则中的名称为解析结果中选项或子命令的名称 (即 `dest`), 也可以写作 `options.foo` 或 `subcommands.bar`
+
+    Args:
+        requires: (名称, 依赖) 对, 名称存在时依赖的所有名称也必须存在
+        conflicts: (名称, 冲突) 对, 名称存在时冲突的名称都不能存在
+        at_most: (数量, 名称组) 对, 名称组中至多存在给定数量个
+        exactly_one: 名称组, 组中必须且只能存在一个
+    """
+    bits: Dict[str, int] = {}
+
+    def bit(name: str) -> int:
+        key = name.split(".", 1)[1] if name.startswith(("options.", "subcommands.")) else name
+        return bits.setdefault(key, 1 << len(bits))
+
+    def mask(names: Union[str, Iterable[str]]) -> Tuple[int, Tuple[str, ...]]:
+        names = (names,) if isinstance(names, str) else tuple(names)
+        result = 0
+        for name in names:
+            result |= bit(name)
+        return result, names
+
+    def group(names: Tuple[str, ...]) -> str:
+        return " | ".join(names)
+
+    # 每条规则编译为 (检查函数, 提示函数), 检查函数只对位掩码做整数运算
+    rules: List[Tuple[Callable[[int], bool], Callable[[int], str]]] = []
+    for name, deps in requires:
+        flag, need, deps = bit(name), *mask(deps)
+        rules.append((
+            lambda present, flag=flag, need=need: bool(present & flag) and present & need != need,
+            lambda _, name=name, deps=deps: lang.require("tools", "actions.requires").format(
+                target=name, requires=group(deps)
+            ),
+        ))
+    for name, others in conflicts:
+        flag, other_mask, others = bit(name), *mask(others)
+        flags = tuple((other, bit(other)) for other in others)
+        rules.append((
+            lambda present, flag=flag, other_mask=other_mask: bool(present & flag and present & other_mask),
+            lambda present, name=name, flags=flags: lang.require("tools", "actions.exclusion").format(
+                left=name, right=group(tuple(other for other, other_flag in flags if present & other_flag))
+            ),
+        ))
+    for count, names in at_most:
+        need, names = mask(names)
+        rules.append((
+            lambda present, count=count, need=need: _popcount(present & need) > count,
+            lambda _, count=count, names=names: lang.require("tools", "actions.at_most").format(
+                count=count, targets=group(names)
+            ),
+        ))
+    for names in exactly_one:
+        need, names = mask(names)
+        rules.append((
+            lambda present, need=need: _popcount(present & need) != 1,
+            lambda _, names=names: lang.require("tools", "actions.exactly_one").format(targets=group(names)),
+        ))
+    # 同一组选项的检查结果总是相同, 按位掩码缓存违反的规则; 提示在抛出时才生成, 以跟随当前语言
+    failed: Dict[int, Tuple[Callable[[int], str], ...]] = {}
+
+    class _ConstraintSet(ArparmaBehavior):
+        def operate(self, interface: "Arparma"):
+            present = 0
+            for name in interface.options:
+                present |= bits.get(name, 0)
+            for name in interface.subcommands:
+                present |= bits.get(name, 0)
+            if (violated := failed.get(present)) is None:
+                if len(failed) >= 4096:
+                    failed.clear()
+                violated = failed[present] = tuple(message for check, message in rules if check(present))
+            if violated:
+                raise ConstraintViolation([message(present) for message in violated])
+
+    return _ConstraintSet()
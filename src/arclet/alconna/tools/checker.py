@@ -1,28 +1,186 @@
-from functools import wraps
-from typing import Callable, Optional, TypeVar
+import asyncio
+from concurrent.futures import Executor
+from functools import partial, wraps
+import inspect
+from inspect import Parameter, iscoroutinefunction
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
-from arclet.alconna import Alconna, CommandMeta, Args
+from arclet.alconna import Args
+from arclet.alconna.args import Arg
+from arclet.alconna.argv import Argv
+from arclet.alconna.exceptions import ArgumentMissing, InvalidParam, ParamsUnmatched
+from nepattern import ANY, BOOLEAN, BYTES, FLOAT, INTEGER, STRING, AnyString
+from tarina import Empty, lang
 from typing_extensions import ParamSpec
 
+from .debug import PreparedArgs
+
 T = TypeVar("T")
 P = ParamSpec("P")
 
+_EXACT = {INTEGER: int, FLOAT: float, BOOLEAN: bool, BYTES: bytes, STRING: str}
+"""内置类型的 pattern 在输入恰为对应类型时直接通过, 无需校验"""
+
+
+def _compile_args(args: Args, method: bool = False) -> Optional[Tuple[Tuple[Arg, Optional[type]], ...]]:
+    """提取可直接校验的参数列表
+
+    仅当参数全部为普通位置参数时返回; 含有 MultiVar / KeyWordVar / 解包参数, 或目标为未绑定方法时返回 None
+    """
+    argument = args.argument
+    if method or argument.unpack or argument.vars_positional or argument.vars_keyword or argument.keyword_only:
+        return None
+    return tuple((arg, _EXACT.get(arg.value)) for arg in argument.normal)
+
+
+def _check_args(params: Tuple[Tuple[Arg, Optional[type]], ...], args: tuple, kwargs: Dict[str, Any]) -> List[Any]:
+    """按参数列表直接校验并转换调用参数, 返回可按位置传入的参数值
+
+    校验规则与 Alconna 解析参数时一致; 失败时抛出 InvalidParam / ArgumentMissing / ParamsUnmatched
+    """
+    if len(args) > len(params):
+        raise ParamsUnmatched(lang.require("analyser", "param_unmatched").format(target=args[len(params)]))
+    result = []
+    used = 0
+    for index, (param, exact) in enumerate(params):
+        name = param.name
+        if index < len(args):
+            arg = args[index]
+            if name in kwargs:
+                raise ParamsUnmatched(lang.require("analyser", "param_unmatched").format(target=f"{name}="))
+        elif name in kwargs:
+            arg = kwargs[name]
+            used += 1
+        elif param.field.default is not Empty:
+            result.append(param.field.default)
+            continue
+        else:
+            raise ArgumentMissing(
+                param.field.get_missing_tips(lang.require("args", "missing").format(key=name))
+            )
+        if type(arg) is exact:
+            result.append(arg)
+            continue
+        value = param.value
+        if (value is STRING and isinstance(arg, str)) or value is ANY:
+            result.append(arg)
+            continue
+        if value is AnyString:
+            result.append(str(arg))
+            continue
+        # 传入的参数校验失败时不回退到默认值, 与命令解析时多余参数视为失败一致
+        res = value.validate(arg)
+        if res.flag == "error":
+            raise InvalidParam(param.field.get_unmatch_tips(arg, res.error().args[0]))
+        result.append(res._value)  # noqa
+    if used != len(kwargs):
+        names = {param.name for param, _ in params}
+        key = next(k for k in kwargs if k not in names)
+        raise ParamsUnmatched(lang.require("args", "key_not_found").format(name=key))
+    return result
+
+
+class _ArgsValidator(PreparedArgs):
+    """`simple_type` 回退路径使用的校验器
+
+    与 `PreparedArgs` 相同, 不会注册到 `command_manager` 中, 也没有消息缓存; 多余的参数视为失败
+    """
+
+    def _analyse(self, argv: Argv, state: None, command: List[Any]):
+        result = super()._analyse(argv, state, command)
+        if argv.current_index != argv.ndata:
+            raise ParamsUnmatched(lang.require("analyser", "param_unmatched").format(target=argv.next(move=False)[0]))
+        return result
+
+    def _error(self, e: Exception):
+        if self.raise_exception:
+            raise e
+        return None
 
-def simple_type(raise_exception: bool = False):
+
+def _binder(func: Callable[..., T], method: bool) -> Callable[[Any, Dict[str, Any]], Tuple[list, Dict[str, Any]]]:
+    """依据函数签名生成将解析结果转为调用参数的函数, 规则同 `Arparma.call`"""
+    params = list(inspect.signature(func).parameters.values())
+    if method:
+        params = params[1:]
+    kinds = [(p.name, p.kind) for p in params]
+
+    def bind(owner: Any, result: Dict[str, Any]) -> Tuple[list, Dict[str, Any]]:
+        pos_args = [] if owner is None else [owner]
+        kw_args = {}
+        for name, kind in kinds:
+            if name not in result:
+                continue
+            if kind in (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD):
+                pos_args.append(result[name])
+            elif kind == Parameter.VAR_POSITIONAL:
+                pos_args.extend(result[name])
+            elif kind == Parameter.VAR_KEYWORD:
+                kw_args.update(result[name])
+            else:
+                kw_args[name] = result[name]
+        return pos_args, kw_args
+
+    return bind
+
+
+def simple_type(
+    raise_exception: bool = False,
+    compiled: bool = True,
+    to_thread: Union[bool, Executor] = False,
+):
+    """为函数添加参数类型校验与转换, 校验失败时返回 None
+
+    协程函数会得到一个异步的包装函数, 校验通过后再等待原函数的结果
+
+    Args:
+        raise_exception (bool, optional): 校验失败时是否抛出异常. 默认为 False.
+        compiled (bool, optional): 是否直接按各参数的 pattern 校验调用参数. 默认为 True.
+            含有可变参数或仅关键字参数的函数仍会回退到完整的命令解析.
+        to_thread (bool | Executor, optional): 仅对协程函数有效, 是否将校验放入线程池中执行, 避免阻塞事件循环.
+            传入 Executor 时使用该线程池, 否则使用事件循环的默认线程池. 默认为 False.
+    """
     def deco(func: Callable[P, T]) -> Callable[P, Optional[T]]:
-        name: str = f"{id(func)}"
-        _cmd = Alconna(
-            name, Args.from_callable(func)[0],
-            meta=CommandMeta(raise_exception=raise_exception)
-        )
+        args, method = Args.from_callable(func)
+        params = _compile_args(args, method) if compiled else None
+
+        if params is not None:
+            def check(*args: P.args, **kwargs: P.kwargs) -> Optional[Tuple[list, Dict[str, Any]]]:
+                try:
+                    return _check_args(params, args, kwargs), {}
+                except (InvalidParam, ArgumentMissing, ParamsUnmatched):
+                    if raise_exception:
+                        raise
+                    return None
+        else:
+            validator = _ArgsValidator(args, raise_exception)
+            call_with = _binder(func, method)
+
+            def check(*args: P.args, **kwargs: P.kwargs) -> Optional[Tuple[list, Dict[str, Any]]]:
+                param = list(args[1:] if method else args)
+                for k, v in kwargs.items():
+                    param.extend([f"{k}=", v])
+                res = validator(param)
+                return None if res is None else call_with(args[0] if method else None, res)
+
+        if iscoroutinefunction(func):
+            executor = None if isinstance(to_thread, bool) else to_thread
+
+            @wraps(func)
+            async def __async_wrapper__(*args: P.args, **kwargs: P.kwargs):
+                if to_thread:
+                    loop = asyncio.get_running_loop()
+                    bound = await loop.run_in_executor(executor, partial(check, *args, **kwargs))
+                else:
+                    bound = check(*args, **kwargs)
+                return None if bound is None else await func(*bound[0], **bound[1])
+
+            return __async_wrapper__  # type: ignore
 
         @wraps(func)
         def __wrapper__(*args: P.args, **kwargs: P.kwargs):
-            param = [name, *args]
-            for k, v in kwargs.items():
-                param.extend([f"{k}=", v])
-            res = _cmd.parse(param)
-            return res.call(func) if res.matched else None
+            bound = check(*args, **kwargs)
+            return None if bound is None else func(*bound[0], **bound[1])
 
         return __wrapper__
 
@@ -1,21 +1,42 @@
+import ast
 import asyncio
+import builtins
+import hashlib
+import importlib
 import inspect
+import json
+import os
 import re
 import sys
+import threading
 import typing
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import Executor as PoolExecutor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import suppress
+from contextvars import ContextVar
+from copy import copy
 from dataclasses import dataclass, field, asdict
-from functools import partial, wraps
-from types import FunctionType, MethodType, ModuleType
+from functools import lru_cache, partial, wraps
+from itertools import islice
+from pathlib import Path
+from types import FunctionType, MappingProxyType, MethodType, ModuleType
 from typing import (
     Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
     Callable,
+    Deque,
     Dict,
+    FrozenSet,
     Generic,
+    Iterable,
     List,
     Literal,
     Mapping,
     Optional,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -26,16 +47,16 @@ from typing import (
 
 from arclet.alconna import Namespace
 from arclet.alconna.args import ArgFlag, Args, Arg
-from arclet.alconna.action import Action
+from arclet.alconna.action import Action, ActType
 from arclet.alconna.arparma import Arparma, ArparmaBehavior
 from arclet.alconna.base import Option, Subcommand
 from arclet.alconna.model import OptionResult
 from arclet.alconna.core import Alconna
-from arclet.alconna.exceptions import NullMessage
+from arclet.alconna.exceptions import InvalidArgs, NullMessage
 from arclet.alconna.manager import command_manager, ShortcutArgs
 from arclet.alconna.typing import TDC, TAValue, KeyWordVar, MultiVar, CommandMeta, AllParam, ShortcutRegWrapper, StrMulti
 from nepattern import ANY, all_patterns, type_parser, RawStr, TPattern
-from tarina import split, split_once, init_spec, lang, Empty
+from tarina import split, init_spec, lang, Empty
 from typing_extensions import get_origin, NotRequired, Self
 
 T = TypeVar("T")
@@ -56,6 +77,176 @@ def default_parser(
     return result.call(func)
 
 
+def _capture(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return args, kwargs
+
+    return wrapper
+
+
+class PoolParser:
+    """
+    将目标提交到线程池或进程池中执行的解析器, 可用于 `Executor.set_parser` 与 `AlconnaDecorate.set_default_parser`
+
+    参数在调用方线程中绑定, 目标在池中执行; 返回 `concurrent.futures.Future`, 若存在正在运行的事件循环则返回 `asyncio.Future`
+
+    Examples:
+        >>> cli = AlconnaDecorate().set_default_parser(PoolParser.thread(max_workers=4, max_pending=16))
+        >>> @cli.command()
+        ... @cli.option("--text", Args["text", str])
+        ... def stats(text: str):
+        ...     return len(text.split())
+        ...
+        >>> stats("stats --text 'a b c'")
+
+    Attributes:
+        pool (concurrent.futures.Executor): 执行目标的线程池或进程池
+        max_pending (Optional[int]): 该解析器未完成任务数量的上限, 为 None 时不限制
+        block (bool): 达到上限时是否等待, 否则返回一个带有异常的 Future
+        timeout (Optional[float]): 等待的最长时间
+    """
+
+    def __init__(
+        self,
+        pool: PoolExecutor,
+        max_pending: Optional[int] = None,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ):
+        self.pool = pool
+        self.max_pending = max_pending
+        self.block = block
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending) if max_pending else None
+        self._targets: Dict[Callable, Callable] = {}
+
+    @classmethod
+    def thread(cls, max_workers: Optional[int] = None, **kwargs) -> "PoolParser":
+        """使用新的 ThreadPoolExecutor 创建解析器"""
+        return cls(ThreadPoolExecutor(max_workers, thread_name_prefix="alconna"), **kwargs)
+
+    @classmethod
+    def process(cls, max_workers: Optional[int] = None, **kwargs) -> "PoolParser":
+        """使用新的 ProcessPoolExecutor 创建解析器, 目标需要能通过模块与名称引用, 参数需要能被 pickle"""
+        return cls(ProcessPoolExecutor(max_workers), **kwargs)
+
+    def _target(self, func: Callable[..., T]) -> Callable[..., T]:
+        if not isinstance(self.pool, ProcessPoolExecutor):
+            return func
+        if func not in self._targets:
+            self._targets[func] = _TargetRef.of(func)
+        return self._targets[func]
+
+    def _submit(self, func: Callable[..., T], args: tuple, kwargs: Dict[str, Any]) -> "Future[T]":
+        try:
+            future = self.pool.submit(func, *args, **kwargs)
+        except BaseException:
+            if self._slots:
+                self._slots.release()
+            raise
+        if self._slots:
+            future.add_done_callback(lambda _: self._slots.release())  # type: ignore
+        return future
+
+    async def _asubmit(
+        self, func: Callable[..., T], args: tuple, kwargs: Dict[str, Any], loop: asyncio.AbstractEventLoop
+    ) -> T:
+        # 在默认线程池中等待空位, 避免阻塞事件循环
+        acquire = loop.run_in_executor(None, self._slots.acquire, True, self.timeout)  # type: ignore
+        try:
+            acquired = await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            acquire.add_done_callback(lambda fut: fut.result() and self._slots.release())  # type: ignore
+            raise
+        if not acquired:
+            raise RuntimeError(lang.require("tools", "construct.pool_busy"))
+        return await asyncio.wrap_future(self._submit(func, args, kwargs), loop=loop)
+
+    def __call__(
+        self,
+        func: Callable[..., T],
+        result: Arparma,
+        local_arg: Dict[str, Any],
+        loop: asyncio.AbstractEventLoop,
+    ) -> "Future[T]":
+        args, kwargs = result.call(_capture(func))
+        func = self._target(func)
+        running = loop.is_running()
+        if not self._slots or self._slots.acquire(False):
+            future = self._submit(func, args, kwargs)
+        elif self.block and running:
+            return loop.create_task(self._asubmit(func, args, kwargs, loop))  # type: ignore
+        elif self.block and self._slots.acquire(True, self.timeout):
+            future = self._submit(func, args, kwargs)
+        else:
+            future = Future()
+            future.set_exception(RuntimeError(lang.require("tools", "construct.pool_busy")))
+        if running:
+            return asyncio.wrap_future(future, loop=loop)  # type: ignore
+        return future
+
+    def shutdown(self, wait: bool = True):
+        """关闭解析器使用的池"""
+        self.pool.shutdown(wait)
+
+
+@lru_cache(maxsize=None)
+def _resolve(module: str, qualname: str) -> Callable:
+    target: Any = importlib.import_module(module)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target.exec_target if isinstance(target, Executor) else target
+
+
+class _TargetRef:
+    """以模块与限定名引用目标函数, 使被 `AlconnaDecorate` 装饰 (模块中的同名对象为 Executor) 的函数也能提交到进程池"""
+
+    __slots__ = ("module", "qualname")
+
+    def __init__(self, module: str, qualname: str):
+        self.module = module
+        self.qualname = qualname
+
+    @classmethod
+    def of(cls, func: Callable) -> Callable:
+        module, qualname = getattr(func, "__module__", None), getattr(func, "__qualname__", "")
+        if module in sys.modules and "<" not in qualname:
+            target: Any = sys.modules[module]
+            for part in qualname.split("."):
+                target = getattr(target, part, None)
+            if target is func:
+                return func
+            if isinstance(target, Executor) and target.exec_target is func:
+                return cls(module, qualname)
+        raise TypeError(lang.require("tools", "construct.pool_target").format(target=func))
+
+    def __call__(self, *args, **kwargs):
+        return _resolve(self.module, self.qualname)(*args, **kwargs)
+
+    def __reduce__(self):
+        return _TargetRef, (self.module, self.qualname)
+
+
+_fallback = threading.local()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """
+    获取正在运行的事件循环, 不在事件循环中时返回当前线程共享的备用循环
+
+    备用循环在首次需要时创建, 在线程对象被回收或进程退出时关闭
+    """
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        loop = getattr(_fallback, "loop", None)
+        if loop is None or loop.is_closed():
+            loop = _fallback.loop = asyncio.new_event_loop()
+            weakref.finalize(threading.current_thread(), loop.close)
+        return loop
+
+
 class Executor(Generic[T]):
     """
     以 click-like 方法创建的 Alconna 结构体, 可以被视为一类 CommanderHandler
@@ -95,25 +286,202 @@ class Executor(Generic[T]):
         return self
 
     def __call__(self, message: TDC) -> Arparma[TDC]:
+        return self.execute(message)[0]
+
+    def execute(self, message: TDC) -> Tuple[Arparma[TDC], Any]:
+        """
+        解析并执行消息, 返回解析结果与解析器的返回值 (例如 PoolParser 返回的 Future)
+
+        Args:
+            message (TDC): 消息
+        """
+        if not self.exec_target:
+            raise RuntimeError(lang.require("tools", "construct.decorate_error"))
+        result = self.command.parse(message)
+        if not result.matched:
+            return result, None
+        return result, self.parser_func(
+            self.exec_target,
+            result,
+            self.local_args,
+            _get_loop(),
+        )
+
+    async def _dispatch(self, result: Arparma, loop: asyncio.AbstractEventLoop):
+        res = self.parser_func(self.exec_target, result, self.local_args, loop)
+        if inspect.isawaitable(res):
+            return await res
+        return res
+
+    async def acall(self, message: TDC) -> Arparma[TDC]:
+        """
+        解析并执行消息, 若目标为协程函数则等待其执行完成
+
+        Args:
+            message (TDC): 消息
+        """
         if not self.exec_target:
             raise RuntimeError(lang.require("tools", "construct.decorate_error"))
         result = self.command.parse(message)
         if result.matched:
-            self.parser_func(
-                self.exec_target,
-                result,
-                self.local_args,
-                asyncio.get_event_loop(),
-            )
+            await self._dispatch(result, asyncio.get_running_loop())
         return result
 
-    def from_commandline(self):
-        """从命令行解析参数"""
+    def batch(self, messages: Iterable[TDC]) -> List[Arparma[TDC]]:
+        """
+        批量解析并执行消息
+
+        事件循环与解析器只获取一次, 结果按输入顺序返回
+
+        Args:
+            messages (Iterable[TDC]): 消息列表
+        """
+        if not self.exec_target:
+            raise RuntimeError(lang.require("tools", "construct.decorate_error"))
+        parse, parser_func, target, local_args = self.command.parse, self.parser_func, self.exec_target, self.local_args
+        loop = _get_loop()
+        results = []
+        for message in messages:
+            result = parse(message)
+            if result.matched:
+                parser_func(target, result, local_args, loop)
+            results.append(result)
+        return results
+
+    async def abatch(self, messages: Union[Iterable[TDC], AsyncIterable[TDC]]) -> AsyncIterator[Arparma[TDC]]:
+        """
+        批量解析并执行消息, `batch` 的异步迭代器形式
+
+        Args:
+            messages (Iterable[TDC] | AsyncIterable[TDC]): 消息列表或异步消息流
+        """
+        if not self.exec_target:
+            raise RuntimeError(lang.require("tools", "construct.decorate_error"))
+        parse, dispatch = self.command.parse, self._dispatch
+        loop = asyncio.get_running_loop()
+        if isinstance(messages, AsyncIterable):
+            async for message in messages:
+                result = parse(message)
+                if result.matched:
+                    await dispatch(result, loop)
+                yield result
+        else:
+            for message in messages:
+                result = parse(message)
+                if result.matched:
+                    await dispatch(result, loop)
+                yield result
+
+    def _commandline(self) -> str:
         if not self.command:
             raise RuntimeError(lang.require("tools", "construct.decorate_error"))
         args = sys.argv[1:]
         args.insert(0, self.command.command)
-        return self.__call__(" ".join(args))
+        return " ".join(args)
+
+    def from_commandline(self):
+        """从命令行解析参数"""
+        return self.__call__(self._commandline())
+
+
+class AsyncExecutor(Executor[T]):
+    """
+    目标为协程函数的 Executor, 调用时返回可等待对象, 并等待目标执行完成
+
+    Examples:
+        >>> cli = AlconnaDecorate()
+        >>> @cli.command(concurrency=8)
+        ... @cli.option("--name|-n", Args["name", str])
+        ... async def hello(name: str):
+        ...     print(f"Hello {name}")
+        ...
+        >>> await hello("hello --name Alice")
+
+    Attributes:
+        concurrency (Optional[int]): 同时执行目标的最大数量, 为 None 时不限制
+    """
+
+    concurrency: Optional[int]
+
+    def __init__(self, command: Alconna, target: Callable[..., Awaitable[T]], concurrency: Optional[int] = None):
+        super().__init__(command, target)
+        self.concurrency = concurrency
+        self._semaphore: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+    def _limit(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        if self._semaphore is None or self._semaphore[0] is not loop:
+            self._semaphore = (loop, asyncio.Semaphore(self.concurrency))  # type: ignore
+        return self._semaphore[1]
+
+    async def _dispatch(self, result: Arparma, loop: asyncio.AbstractEventLoop):
+        if self.concurrency is None:
+            return await super()._dispatch(result, loop)
+        # 在调用解析器之前获取许可, 使 PoolParser 等解析器提交的任务同样受并发数限制
+        async with self._limit(loop):
+            return await super()._dispatch(result, loop)
+
+    def __call__(self, message: TDC) -> Awaitable[Arparma[TDC]]:  # type: ignore
+        return self.acall(message)
+
+    async def _gather(self, messages: Iterable[TDC]) -> List[Arparma[TDC]]:
+        parse, dispatch = self.command.parse, self._dispatch
+        loop = asyncio.get_running_loop()
+        results = [parse(message) for message in messages]
+        await asyncio.gather(*(dispatch(result, loop) for result in results if result.matched))
+        return results
+
+    def batch(self, messages: Iterable[TDC]) -> List[Arparma[TDC]]:
+        """
+        批量解析消息并在新的事件循环中并发执行目标, 不能在正在运行的事件循环中调用, 此时请使用 `abatch`
+
+        Args:
+            messages (Iterable[TDC]): 消息列表
+        """
+        if not self.exec_target:
+            raise RuntimeError(lang.require("tools", "construct.decorate_error"))
+        return asyncio.run(self._gather(messages))
+
+    async def abatch(self, messages: Union[Iterable[TDC], AsyncIterable[TDC]]) -> AsyncIterator[Arparma[TDC]]:
+        """
+        批量解析消息并并发执行目标, 并发数受 `concurrency` 限制, 结果按输入顺序产出
+
+        Args:
+            messages (Iterable[TDC] | AsyncIterable[TDC]): 消息列表或异步消息流
+        """
+        if not self.exec_target:
+            raise RuntimeError(lang.require("tools", "construct.decorate_error"))
+        parse, dispatch = self.command.parse, self._dispatch
+        loop = asyncio.get_running_loop()
+        pending: Deque[Tuple[Arparma[TDC], Optional["asyncio.Task"]]] = deque()
+        if not isinstance(messages, AsyncIterable):
+            messages = _aiter(messages)
+        try:
+            async for message in messages:
+                result = parse(message)
+                pending.append((result, loop.create_task(dispatch(result, loop)) if result.matched else None))
+                while pending and (pending[0][1] is None or pending[0][1].done()):
+                    result, task = pending.popleft()
+                    if task:
+                        task.result()
+                    yield result
+            while pending:
+                result, task = pending.popleft()
+                if task:
+                    await task
+                yield result
+        finally:
+            for _, task in pending:
+                if task:
+                    task.cancel()
+
+    def from_commandline(self):
+        """从命令行解析参数, 在新的事件循环中等待目标执行完成"""
+        return asyncio.run(self.acall(self._commandline()))
+
+
+async def _aiter(messages: Iterable[T]) -> AsyncIterator[T]:
+    for message in messages:
+        yield message
 
 
 # ----------------------------------------
@@ -160,13 +528,17 @@ class AlconnaDecorate:
         self,
         name: Optional[str] = None,
         headers: Optional[List[Any]] = None,
+        concurrency: Optional[int] = None,
     ) -> Callable[[Callable[..., T]], Executor[T]]:
         """
         开始构建命令
 
+        若被装饰的函数为协程函数, 则生成 AsyncExecutor
+
         Args:
             name (Optional[str]): 命令名称
             headers (Optional[List[Any]]): 命令前缀
+            concurrency (Optional[int]): 协程函数同时执行的最大数量, 仅对 AsyncExecutor 生效
         """
         self.building = True
 
@@ -182,6 +554,8 @@ class AlconnaDecorate:
             if alc.meta.example and "$" in alc.meta.example:
                 alc.meta.example = alc.meta.example.replace("$", str(alc.prefixes[0]) if alc.prefixes else "")
             self.building = False
+            if inspect.iscoroutinefunction(func):
+                return AsyncExecutor(alc, func, concurrency).set_parser(self.default_parser)
             return Executor(alc, func).set_parser(self.default_parser)
 
         return wrapper
@@ -292,10 +666,210 @@ class AlconnaDecorate:
         return self
 
 
-def args_from_list(args: List[List[str]], custom_types: Dict[str, type]) -> Args:
+_MULTI_SPEC = re.compile(r"^(?P<name>.+?)(?P<multi>[+*]+)(\[)?(?P<slice>\d*)(])?$")
+_NO_TYPES: Mapping[str, Any] = MappingProxyType({})
+
+ARGS_CACHE_SIZE = 4096
+"""args_from_list 缓存的最大条目数"""
+_args_cache: "OrderedDict[Tuple[Tuple[str, ...], int], Tuple[Mapping[str, Any], tuple, str, Any, Any]]" = OrderedDict()
+_args_cache_lock = threading.Lock()
+
+
+def clear_args_cache():
+    """清空 args_from_list 的缓存"""
+    with _args_cache_lock:
+        _args_cache.clear()
+
+
+_TYPING_NAMES: Mapping[str, Any] = MappingProxyType({
+    **{k: getattr(typing, k) for k in typing.__all__},
+    "StrMulti": StrMulti,
+    "None": None,
+})
+"""类型表达式中优先于 custom_types 的名称, 只读"""
+_BUILTIN_NAMES: Mapping[str, Any] = MappingProxyType({k: v for k, v in vars(builtins).items() if isinstance(v, type)})
+"""类型表达式中在 custom_types 之后查找的内置类型, 只读"""
+_TYPE_TOKEN = re.compile(
+    r"\s*(?:(?P<str>'[^']*'|\"[^\"]*\")|(?P<num>-?\d+(?:\.\d+)?)|(?P<ellipsis>\.\.\.)"
+    r"|(?P<name>[^\W\d][\w.]*)|(?P<op>[\[\],|]))"
+)
+_TYPE_CONSTS = {"True": True, "False": False, "None": None}
+
+
+@lru_cache(maxsize=1024)
+def _parse_type(expr: str) -> tuple:
+    """
+    将类型表达式解析为语法树, 不执行任何代码
+
+    支持名称, 点号访问, `X[...]` 下标 (如 `List[int]`, `Optional[str]`, `Literal['a', 1]`, `Tuple[int, ...]`) 与 `|` 联合;
+    `True`, `False`, `None` 与 `...` 视为字面量
+
+    Raises:
+        ValueError: 表达式不合法
+    """
+    tokens = []
+    pos = 0
+    while pos < len(expr):
+        if not (mat := _TYPE_TOKEN.match(expr, pos)):
+            if expr[pos:].strip():
+                raise ValueError(expr)
+            break
+        kind = mat.lastgroup
+        text = mat[kind]  # type: ignore
+        if kind == "str":
+            tokens.append(("lit", text[1:-1]))
+        elif kind == "num":
+            tokens.append(("lit", float(text) if "." in text else int(text)))
+        elif kind == "ellipsis":
+            tokens.append(("lit", ...))
+        elif kind == "name" and text in _TYPE_CONSTS:
+            tokens.append(("lit", _TYPE_CONSTS[text]))
+        else:
+            tokens.append((kind, text))
+        pos = mat.end()
+    tokens.append(("end", ""))
+    index = 0
+
+    def union():
+        nonlocal index
+        nodes = [term()]
+        while tokens[index] == ("op", "|"):
+            index += 1
+            nodes.append(term())
+        return nodes[0] if len(nodes) == 1 else ("union", tuple(nodes))
+
+    def term():
+        nonlocal index
+        kind, text = tokens[index]
+        index += 1
+        if kind == "lit":
+            return "lit", text
+        if kind != "name":
+            raise ValueError(expr)
+        node = ("name", text)
+        if tokens[index] == ("op", "["):
+            index += 1
+            params = [union()]
+            while tokens[index] == ("op", ","):
+                index += 1
+                params.append(union())
+            if tokens[index] != ("op", "]"):
+                raise ValueError(expr)
+            index += 1
+            node = ("sub", node, tuple(params))
+        return node
+
+    tree = union()
+    if tokens[index][0] != "end":
+        raise ValueError(expr)
+    return tree
+
+
+def _type_names(node: tuple) -> Iterable[str]:
+    """语法树中需要在 custom_types 中查找的名称"""
+    kind = node[0]
+    if kind == "name":
+        head = node[1].split(".", 1)[0]
+        if head not in _TYPING_NAMES:
+            yield head
+    elif kind == "sub":
+        yield from _type_names(node[1])
+        for i in node[2]:
+            yield from _type_names(i)
+    elif kind == "union":
+        for i in node[1]:
+            yield from _type_names(i)
+
+
+def _eval_type(node: tuple, custom_types: Mapping[str, Any]) -> Any:
+    """
+    依据名称表解析语法树
+
+    名称的查找顺序与 `eval(expr, {**custom_types, **typing.__dict__})` 一致:
+    先查找 typing 中的名称, 再查找 custom_types, 最后查找内置类型
+
+    Raises:
+        NameError: 名称不存在
+    """
+    kind = node[0]
+    if kind == "lit":
+        return node[1]
+    if kind == "name":
+        head, *attrs = node[1].split(".")
+        if (
+            (value := _TYPING_NAMES.get(head, Empty)) is Empty
+            and (value := custom_types.get(head, Empty)) is Empty
+            and (value := _BUILTIN_NAMES.get(head, Empty)) is Empty
+        ):
+            raise NameError(head)
+        for attr in attrs:
+            if attr.startswith("_") or (value := getattr(value, attr, Empty)) is Empty:
+                raise NameError(node[1])
+        return value
+    if kind == "sub":
+        origin = _eval_type(node[1], custom_types)
+        params = tuple(_eval_type(i, custom_types) for i in node[2])
+        return origin[params if len(params) > 1 else params[0]]
+    return Union[tuple(_eval_type(i, custom_types) for i in node[1])]  # type: ignore
+
+
+def _resolve_arg(
+    arg: Tuple[str, ...], custom_types: Mapping[str, Any]
+) -> Tuple[str, Any, Any, bool, Tuple[str, ...]]:
+    """解析单个参数, 返回 (名称, 值, 默认值, 类型是否解析成功, 用到的 custom_types 中的名称)"""
+    _le = len(arg)
+    default = arg[2] if _le > 2 else Empty
+    name = arg[0]
+    value = (
+        AllParam
+        if name.startswith("...") else
+        (arg[1] if _le > 1 else ANY)
+    )
+    name = name.replace("...", "")
+    resolved = True
+    names: Tuple[str, ...] = ()
+    _multi, _kw, _slice = "", False, -1
+    if isinstance(value, str):
+        if mat := _MULTI_SPEC.match(value):
+            value = mat["name"]
+            _multi = mat["multi"][0]
+            _kw = len(mat["multi"]) > 1
+            _slice = int(mat["slice"] or -1)
+        elif value in ("+str", "mstr", "strm"):
+            value = "StrMulti"
+        with suppress(NameError, ValueError, TypeError):
+            if (pattern := all_patterns().get(value, None)) is None:
+                tree = _parse_type(value)
+                names = tuple(_type_names(tree))
+                try:
+                    pattern = type_parser(_eval_type(tree, custom_types))
+                except (NameError, TypeError) as e:
+                    # 单个名称解析失败时视为字面量; 下标与联合表达式无法作为字面量匹配, 直接报错
+                    if tree[0] in ("sub", "union"):
+                        raise InvalidArgs(
+                            lang.require("tools", "construct.type_error").format(target=value, error=repr(e))
+                        ) from e
+                    raise
+            value = pattern  # type: ignore
+            default = (
+                (get_origin(value.origin) or value.origin)(default)
+                if default is not Empty
+                else default
+            )
+        resolved = not isinstance(value, str)
+        if _multi:
+            value = MultiVar(
+                KeyWordVar(value) if _kw else value, _slice if _slice > 1 else _multi,  # type: ignore
+            )
+    return name, value, default, resolved, names
+
+
+def args_from_list(args: List[List[str]], custom_types: Mapping[str, Any]) -> Args:
     """
     从处理好的字符串列表中生成Args
 
+    每个参数的解析结果以 (参数字符串, 类型映射) 为键缓存; 命中时会检查用到的名称在类型映射中的值是否改变, 改变则重新解析
+
     Examples:
         >>> args_from_list([["foo", "str"], ["bar", "digit", "123"]], {"digit":int})
         Args(foo: str, bar: int = 123)
@@ -304,45 +878,33 @@ def args_from_list(args: List[List[str]], custom_types: Dict[str, type]) -> Args
     """
     _args = Args()
     for arg in args:
-        if (_le := len(arg)) == 0:
+        if len(arg) == 0:
             raise NullMessage
-        default = arg[2].strip(" ") if _le > 2 else Empty
-        name = arg[0].strip(" ")
-        value = (
-            AllParam
-            if name.startswith("...") else
-            (arg[1].strip(" ") if _le > 1 else ANY)
-        )
-        name = name.replace("...", "")
-        _multi, _kw, _slice = "", False, -1
-        if isinstance(value, str):
-            if mat := re.match(
-                r"^(?P<name>.+?)(?P<multi>[+*]+)(\[)?(?P<slice>\d*)(])?$", value
-            ):
-                value = mat["name"]
-                _multi = mat["multi"][0]
-                _kw = len(mat["multi"]) > 1
-                _slice = int(mat["slice"] or -1)
-            elif value in ("+str", "mstr", "strm"):
-                value = "StrMulti"
-            with suppress(NameError, ValueError, TypeError):
-                _types = custom_types.copy()
-                _types.update(typing.__dict__)
-                _types["StrMulti"] = StrMulti  # type: ignore
-                value = all_patterns().get(value, None) or type_parser(eval(value, _types))  # type: ignore
-                default = (
-                    (get_origin(value.origin) or value.origin)(default)
-                    if default is not Empty
-                    else default
-                )
-            if _multi:
-                value = MultiVar(
-                    KeyWordVar(value) if _kw else value, _slice if _slice > 1 else _multi,  # type: ignore
-                )
+        name, value, default = _cached_arg(tuple(part.strip(" ") for part in arg), custom_types)
         _args.add(name, value=value, default=default)  # type: ignore
     return _args
 
 
+def _cached_arg(spec: Tuple[str, ...], custom_types: Mapping[str, Any]) -> Tuple[str, Any, Any]:
+    key = (spec, id(custom_types))
+    with _args_cache_lock:
+        if (
+            (cached := _args_cache.get(key))
+            and cached[0] is custom_types
+            and all(custom_types.get(k, Empty) is v for k, v in cached[1])
+        ):
+            _args_cache.move_to_end(key)
+            return cached[2:]
+    name, value, default, resolved, names = _resolve_arg(spec, custom_types)
+    if resolved:
+        deps = tuple((k, custom_types.get(k, Empty)) for k in names)
+        with _args_cache_lock:
+            _args_cache[key] = (custom_types, deps, name, value, default)
+            while len(_args_cache) > ARGS_CACHE_SIZE:
+                _args_cache.popitem(last=False)
+    return name, value, default
+
+
 def args_from_string(string: str, formats: Mapping[str, Union[TAValue, Args, Arg]], args: Args):
     if mat := re.match(r"^\{(?P<pattern>.+?)}$", string):
         pat = mat["pattern"]
@@ -357,7 +919,7 @@ def args_from_string(string: str, formats: Mapping[str, Union[TAValue, Args, Arg
             if len(part) == 1:
                 args.__merge__([part[0], ANY])
             else:
-                args.__merge__(args_from_list([part], {}))
+                args.__merge__(args_from_list([part], _NO_TYPES))
     else:
         args.__merge__([string, RawStr(string)])
 
@@ -389,15 +951,206 @@ def alconna_from_format(
         >>> alc1.parse("lp user AAA perm info admin.all")
     """
     formats = format_args or {}
-    _key_ref = 0
+    return _format_build(spec_from_format(format_string, frozenset(formats)), formats, meta, union)
+
+
+def _format_build(
+    spec: "AlconnaSpec", formats: Mapping[str, Any], meta: Optional[CommandMeta], union: bool
+) -> "Alconna":
+    builder = AlconnaString.from_spec(spec, _NO_TYPES, formats)
+    if meta is not None:
+        builder.meta = meta
+    alc = builder.build()
+    if union:
+        with suppress(ValueError):
+            return command_manager.get_command(alc.path) | alc
+    return alc
+
+
+class ArgSpec(TypedDict):
+    """koishi-like 语法中单个参数的中间表示"""
+    name: str
+    value: NotRequired[str]
+    default: NotRequired[str]
+    optional: NotRequired[bool]
+    raw: NotRequired[bool]
+    format: NotRequired[bool]
+
+
+class NodeSpec(TypedDict):
+    """koishi-like 语法中选项或子命令的中间表示"""
+    type: Literal["option", "subcommand"]
+    dest: str
+    aliases: List[str]
+    args: List[ArgSpec]
+    help: NotRequired[str]
+    default: NotRequired[Any]
+    action: NotRequired[Dict[str, Any]]
+
+
+class CommandSpec(TypedDict):
+    """koishi-like 语法中命令头部的中间表示"""
+    prefixes: NotRequired[List[str]]
+    command: str
+    args: List[ArgSpec]
+    help: NotRequired[str]
+
+
+class AlconnaSpec(CommandSpec):
+    """可序列化的完整命令定义, 由 `SpecCache` 读写"""
+    nodes: List[NodeSpec]
+    meta: Dict[str, Any]
+    namespace: NotRequired[str]
+
+
+_SPEC_HEAD = re.compile(r"^\s*(?:\[(?P<prefixes>[^\]]+)])?(?P<command>\S*)\s*(?P<body>.*)$", re.S)
+_SPEC_HELP = re.compile(r"(?:^|\s)#(?P<help>.+)$")
+_SPEC_NESTED = r"(?:[^\[\]]|\[(?:[^\[\]]|\[[^\[\]]*])*])*"
+_SPEC_TOKEN = re.compile(
+    rf"<(?P<required>[^<>]*)>|\[(?P<optional>{_SPEC_NESTED})]|(?P<word>[^\s<\[]+)|(?P<error>\S+)"
+)
+_SPEC_FIELD = re.compile(r"[:=](?![^\[]*])")
+
+
+def _split_help(spec: str) -> Tuple[str, Optional[str]]:
+    if mat := _SPEC_HELP.search(spec):
+        return spec[: mat.start()].strip(), mat["help"]
+    return spec.strip(), None
+
+
+@lru_cache(maxsize=4096)
+def parse_args_spec(spec: str) -> List[ArgSpec]:
+    """将 koishi-like 的参数字符串解析为参数的中间表示
+
+    `<name:type=default>` 为必选参数, `[name:type]` 为可选参数, 其余单词视为 RawStr 参数
+
+    结果会被缓存, 请勿修改
+
+    Examples:
+        >>> parse_args_spec("<foo:int=1> [bar]")
+        [{'name': 'foo', 'value': 'int', 'default': '1'}, {'name': 'bar', 'optional': True}]
+    """
+    result: List[ArgSpec] = []
+    for mat in _SPEC_TOKEN.finditer(spec):
+        kind = mat.lastgroup
+        if kind == "word":
+            result.append({"name": mat["word"], "raw": True})
+            continue
+        if kind == "error":
+            raise ValueError(lang.require("tools", "construct.format_error").format(target=mat["error"]))
+        parts = _SPEC_FIELD.split(mat[kind])
+        arg: ArgSpec = {"name": parts[0]}
+        if len(parts) > 1:
+            arg["value"] = parts[1]
+        if len(parts) > 2:
+            arg["default"] = parts[2]
+        if kind == "optional":
+            arg["optional"] = True
+        result.append(arg)
+    return result
+
+
+@lru_cache(maxsize=4096)
+def parse_command_spec(command: str) -> CommandSpec:
+    """将 koishi-like 的命令字符串解析为命令的中间表示, 例如 `[!|/]test <message:str:hello> #HELP_STRING`
+
+    结果会被缓存, 请勿修改
+    """
+    mat = cast(re.Match, _SPEC_HEAD.match(command))
+    body, help_text = _split_help(mat["body"])
+    spec: CommandSpec = {"command": mat["command"], "args": parse_args_spec(body)}
+    if mat["prefixes"]:
+        spec["prefixes"] = mat["prefixes"].split("|")
+    if help_text:
+        spec["help"] = help_text
+    return spec
+
+
+@lru_cache(maxsize=4096)
+def parse_node_spec(
+    name: str, opt: Optional[str] = None, kind: Literal["option", "subcommand"] = "option"
+) -> NodeSpec:
+    """将 koishi-like 的选项或子命令字符串解析为中间表示, name 与 opt 的含义同 `AlconnaString.option`
+
+    结果会被缓存, 请勿修改
+    """
+    body, help_text = _split_help(name if opt is None else opt)
+    args = parse_args_spec(body)
+    index = next((i for i, arg in enumerate(args) if not arg.get("raw")), len(args))
+    words = [arg["name"] for arg in args[:index]]
+    first = words[0] if words else ""
+    dest = name if opt else first.lstrip("-")
+    if kind == "option":
+        aliases = [f"--{name}" if opt else first, *words]
+    else:
+        aliases = [dest, *words]
+    spec: NodeSpec = {"type": kind, "dest": dest, "aliases": aliases, "args": args[index:]}
+    if help_text:
+        spec["help"] = help_text
+    return spec
+
+
+def args_from_spec(
+    specs: Iterable[ArgSpec],
+    custom_types: Mapping[str, Any],
+    formats: Optional[Mapping[str, Union[TAValue, Args, Arg]]] = None,
+) -> Args:
+    """从参数的中间表示中生成Args, 标记为 format 的参数从 formats 中取值"""
+    _args: List[Arg] = []
+    for spec in specs:
+        name = spec["name"]
+        if spec.get("raw"):
+            _args.append(Arg(name, RawStr(name)))
+            continue
+        if spec.get("format"):
+            value = (formats or {})[name]
+            if isinstance(value, Args):
+                _args.extend(value.argument)
+            elif isinstance(value, Arg):
+                _args.append(value)
+            else:
+                _args.append(Arg(name, value))
+            continue
+        parts = [f"{name};?" if spec.get("optional") else name]
+        if "value" in spec:
+            parts.append(spec["value"])
+            if "default" in spec:
+                parts.append(spec["default"])
+        name, value, default = _cached_arg(tuple(part.strip(" ") for part in parts), custom_types)
+        _args.append(Arg(name, value, default))  # type: ignore
+    return Args(*_args)
+
+
+_FORMAT_SLOT = re.compile(r"^\{(?P<pattern>.+?)}$")
+
+
+def _format_arg(string: str, keys: FrozenSet[str]) -> ArgSpec:
+    if not (mat := _FORMAT_SLOT.match(string)):
+        return {"name": string, "raw": True}
+    pat = mat["pattern"]
+    if pat in keys:
+        return {"name": pat, "format": True}
+    parts = re.split("[:=]", pat)
+    arg: ArgSpec = {"name": parts[0]}
+    if len(parts) > 1:
+        arg["value"] = parts[1]
+    if len(parts) > 2:
+        arg["default"] = parts[2]
+    return arg
+
+
+@lru_cache(maxsize=1024)
+def spec_from_format(format_string: str, keys: FrozenSet[str] = frozenset()) -> AlconnaSpec:
+    """将 `alconna_from_format` 的格式化字符串解析为命令定义, keys 为 format_args 中的键
+
+    结果会被缓存, 请勿修改
+    """
     strings = split(format_string.replace("{", "\"{").replace("}", "}\""), " ")
     command = strings.pop(0)
-    data = []
+    spec: AlconnaSpec = {"command": command, "args": [], "nodes": [], "meta": {}}
     if mat := re.match(r"^\[(.+?)]$", command):
-        data.append([i.strip() for i in mat["data"].split("|")])
-    else:
-        data.append(command)
-    main_args = Args()
+        spec["command"] = ""
+        spec["prefixes"] = [i.strip() for i in mat[1].split("|")]
     _finish_arg = False
     _stack = []
     for string in strings:
@@ -406,23 +1159,58 @@ def alconna_from_format(
             _stack.append(string)
             continue
         if not _finish_arg:
-            args_from_string(string, formats, main_args)
+            spec["args"].append(_format_arg(string, keys))
         elif not _stack:
-            raise ValueError(lang.require("tools", "construct.format_error".format(target=string)))
+            raise ValueError(lang.require("tools", "construct.format_error").format(target=string))
         else:
-            singles = _stack[:-1]
-            name = _stack[-1]
-            _opt_args = Args()
-            args_from_string(string, formats, _opt_args)
-            data.extend(Option(single) for single in singles)
-            data.append(Option(name, _opt_args))
-    alc = Alconna(main_args, *data, meta=meta)
-    if union:
-        with suppress(ValueError):
-            cmd = command_manager.get_command(alc.path)
-            cmd = cmd | alc
-            return cmd
-    return alc
+            spec["nodes"].extend(
+                {"type": "option", "dest": "", "aliases": [single], "args": []} for single in _stack[:-1]
+            )
+            spec["nodes"].append(
+                {"type": "option", "dest": "", "aliases": [_stack[-1]], "args": [_format_arg(string, keys)]}
+            )
+    return spec
+
+
+def _jsonable(value: Any) -> bool:
+    """值经过 JSON 序列化与反序列化后是否与原值完全一致"""
+    try:
+        return _same(json.loads(json.dumps(value)), value)
+    except (TypeError, ValueError):
+        return False
+
+
+def _same(loaded: Any, value: Any) -> bool:
+    if type(loaded) is not type(value):
+        return False
+    if isinstance(value, list):
+        return len(loaded) == len(value) and all(_same(i, j) for i, j in zip(loaded, value))
+    if isinstance(value, dict):
+        return loaded.keys() == value.keys() and all(_same(loaded[k], v) for k, v in value.items())
+    return loaded == value
+
+
+def _action_to_spec(action: Action) -> Optional[Dict[str, Any]]:
+    """将选项的动作转为可序列化的形式, 默认的 store/append 的值 (含 Ellipsis) 省略不写; 无法序列化时返回 None"""
+    if action.value is Ellipsis or (action.type == ActType.APPEND and action.value == [Ellipsis]):
+        return {"type": int(action.type)}
+    if _jsonable(action.value):
+        return {"type": int(action.type), "value": action.value}
+    return None
+
+
+def _action_from_spec(spec: Optional[Dict[str, Any]]) -> Optional[Action]:
+    if spec is None:
+        return None
+    act = ActType(spec["type"])
+    if "value" in spec:
+        return Action(act, spec["value"])
+    return Action(act, [Ellipsis] if act == ActType.APPEND else Ellipsis)
+
+
+def _caller_globals(depth: int = 2) -> Dict[str, Any]:
+    """获取调用方所在模块的全局变量, 代替开销较大的 inspect.stack()"""
+    return sys._getframe(depth).f_globals
 
 
 class AlconnaString:
@@ -440,63 +1228,140 @@ class AlconnaString:
         >>> alc.parse("test abcd --foo True")
     """
     @staticmethod
-    def args_gen(pattern: str, types: dict):
-        args = Args()
-        temp = []
-        quote = False
-        for char in pattern:
-            if char == " " and not quote:
-                if temp:
-                    args.__merge__([temp[0], RawStr(temp[0])])
-                    temp.clear()
-                continue
-            if char in {"<", "["}:  # start
-                quote = True
-                temp.append("")
-            elif char == ">":
-                args.__merge__(args_from_list([temp], types.copy()))
-                temp.clear()
-                quote = False
-            elif char == "]":
-                temp[0] = f"{temp[0]};?"
-                args.__merge__(args_from_list([temp], types.copy()))
-                temp.clear()
-                quote = False
-            elif char in {":", "="}:
-                temp.append("")
-            elif not temp:
-                temp.append(char)
-            else:
-                temp[-1] += char
-        return args
+    def args_gen(pattern: str, types: Mapping[str, Any]):
+        return args_from_spec(parse_args_spec(pattern), types)
 
-    def __init__(self, command: str, help_text: Optional[str] = None, meta: Optional[CommandMeta] = None):
+    def __init__(
+        self,
+        command: str,
+        help_text: Optional[str] = None,
+        meta: Optional[CommandMeta] = None,
+        types: Optional[Mapping[str, Any]] = None,
+    ):
         """创建 AlconnaString
 
         Args:
             command (str): 命令字符串, 例如 `test <message:str:hello> #HELP_STRING`
             help_text (Optional[str], optional): 选填的命令的帮助文本.
             meta (Optional[CommandMeta], optional): 选填的命令元数据.
+            types (Optional[Mapping[str, Any]], optional): 解析自定义类型时使用的名称表, 默认为调用方模块的全局变量.
         """
+        self._setup(_caller_globals() if types is None else types)
+        spec = parse_command_spec(command)
+        self.meta = CommandMeta(fuzzy_match=True) if meta is None else CommandMeta(**asdict(meta))
+        if "help" in spec:
+            self.meta.description = spec["help"]
+        elif help_text:
+            self.meta.description = help_text
+        elif self.meta.description == "Unknown":
+            self.meta.description = command.split(" ", 1)[0]
+        self._set_head(spec)
+
+    def _setup(self, types: Mapping[str, Any]):
+        self.types = types
         self.buffer = {}
         self.options = []
         self.shortcuts = []
         self.actions = []
-        head, others = split_once(command, " ")
-        self.meta = CommandMeta(fuzzy_match=True) if meta is None else CommandMeta(**asdict(meta))
-        if help_text:
-            self.meta.description = help_text
-        elif self.meta.description == "Unknown":
-            self.meta.description = head
-        if mat := re.match(r"^\[(.+?)]", head):
-            self.buffer["prefixes"] = mat[1].split("|")
-            head = head[mat.end():]
-        self.buffer["command"] = head.lstrip()
-        if help_string := re.findall(r"(?: )#(.+)$", others):  # noqa
-            self.meta.description = help_string[0]
-            others = others[: -len(help_string[0]) - 1].rstrip()
-        custom_types = getattr(inspect.getmodule(inspect.stack()[1][0]), "__dict__", {})
-        self.buffer["main_args"] = self.args_gen(others, custom_types.copy())
+        self.nodes: List[NodeSpec] = []
+        self.lossy: List[str] = []
+
+    def _set_head(self, spec: CommandSpec, formats: Optional[Mapping[str, Any]] = None):
+        self.head = spec
+        if "prefixes" in spec:
+            self.buffer["prefixes"] = list(spec["prefixes"])
+        self.buffer["command"] = spec["command"]
+        self.buffer["main_args"] = args_from_spec(spec["args"], self.types, formats)
+
+    def _add_node(
+        self,
+        spec: NodeSpec,
+        default: Any = Empty,
+        action: Optional[Action] = None,
+        types: Optional[Mapping[str, Any]] = None,
+        formats: Optional[Mapping[str, Any]] = None,
+    ):
+        _default = OptionResult(args=default) if isinstance(default, dict) else default
+        _args = args_from_spec(spec["args"], self.types if types is None else types, formats)
+        if spec["type"] == "option":
+            _opt = Option(
+                "|".join(spec["aliases"]),
+                _args,
+                dest=spec["dest"] or None,
+                default=_default,
+                action=action,
+                help_text=spec.get("help"),
+            )
+        else:
+            _opt = Subcommand(
+                "|".join(spec["aliases"]),
+                _args,
+                dest=spec["dest"] or None,
+                default=_default,
+                help_text=spec.get("help"),
+            )
+        self.options.append(_opt)
+        node: NodeSpec = {**spec}  # type: ignore
+        name = "|".join(spec["aliases"])
+        if default is not Empty:
+            node["default"] = default
+            if not _jsonable(default):
+                self.lossy.append(f"{name}.default")
+        if action is not None:
+            if (act := _action_to_spec(action)) is None:
+                self.lossy.append(f"{name}.action")
+            else:
+                node["action"] = act
+        if types is not None and types is not self.types:
+            self.lossy.append(f"{name}.types")
+        self.nodes.append(node)
+
+    @classmethod
+    def from_spec(
+        cls,
+        spec: AlconnaSpec,
+        types: Optional[Mapping[str, Any]] = None,
+        formats: Optional[Mapping[str, Union[TAValue, Args, Arg]]] = None,
+    ) -> Self:
+        """从 `to_spec` 导出的命令定义中恢复 AlconnaString, 跳过字符串的解析
+
+        Args:
+            spec (AlconnaSpec): 命令定义
+            types (Optional[Mapping[str, Any]], optional): 解析自定义类型时使用的名称表, 默认为调用方模块的全局变量.
+            formats (Optional[Mapping[str, Union[TAValue, Args, Arg]]], optional): 格式化参数, 用于 `alconna_from_format` 导出的定义.
+        """
+        self = cls.__new__(cls)
+        self._setup(_caller_globals() if types is None else types)
+        self.meta = CommandMeta(**spec["meta"])
+        self._set_head(spec, formats)
+        if "namespace" in spec:
+            self.buffer["namespace"] = spec["namespace"]
+        for node in spec["nodes"]:
+            self._add_node(node, node.get("default", Empty), _action_from_spec(node.get("action")), formats=formats)
+        return self
+
+    def to_spec(self) -> AlconnaSpec:
+        """导出可序列化为 JSON 的命令定义
+
+        Raises:
+            ValueError: 定义无法被完整还原, 例如含有快捷指令、`action` 注册的函数、单独指定的类型名称表,
+                或无法经 JSON 原样还原的默认值、动作的值、元数据与 Namespace 对象
+        """
+        lossy = list(self.lossy)
+        if self.shortcuts:
+            lossy.append("shortcut")
+        if self.actions:
+            lossy.append("action")
+        meta = asdict(self.meta)
+        lossy.extend(f"meta.{k}" for k, v in meta.items() if not _jsonable(v))
+        if (ns := self.buffer.get("namespace")) is not None and not isinstance(ns, str):
+            lossy.append("namespace")
+        if lossy:
+            raise ValueError(lang.require("tools", "construct.spec_lossy").format(target=", ".join(lossy)))
+        spec: AlconnaSpec = {**self.head, "nodes": list(self.nodes), "meta": meta}  # type: ignore
+        if ns is not None:
+            spec["namespace"] = ns
+        return spec
 
     def alias(self, *alias: str) -> Self:
         """设置命令的别名"""
@@ -548,7 +1413,14 @@ class AlconnaString:
         self.buffer["namespace"] = ns
         return self
 
-    def option(self, name: str, opt: Optional[str] = None, default: Any = Empty, action: Optional[Action] = None) -> Self:
+    def option(
+        self,
+        name: str,
+        opt: Optional[str] = None,
+        default: Any = Empty,
+        action: Optional[Action] = None,
+        types: Optional[Mapping[str, Any]] = None,
+    ) -> Self:
         """添加一个选项
 
         name 与 opt 有四种情况:
@@ -562,33 +1434,14 @@ class AlconnaString:
             opt (Optional[str], optional): 选项的字符串, 例如 `--foo -f <val:bool>`.
             default (Any, optional): 选项的默认值.
             action (Optional[Action], optional): 选项的动作.
+            types (Optional[Mapping[str, Any]], optional): 解析自定义类型时使用的名称表, 默认与构造时相同.
         """
-        _default = default
-        if isinstance(default, dict):
-            _default = OptionResult(args=default)
-        opt_string = name if opt is None else opt
-        help_text = None
-        if help_string := re.findall(r"(?: )?#(.+)$", opt_string):  # noqa
-            help_text = help_string[0]
-            opt_string = opt_string[: -len(help_string[0]) - 1].rstrip()
-        parts = split(opt_string, " ")
-        dest = name if opt else parts[0].lstrip("-")
-        aliases = [f"--{name}" if opt else parts[0]]
-        index = 0
-        for part in parts:
-            if part.startswith("<") or part.startswith("[") or part.startswith("#"):
-                break
-            aliases.append(part)
-            index += 1
-        _args = Args()
-        if parts[index:]:
-            custom_types = getattr(inspect.getmodule(inspect.stack()[1][0]), "__dict__", {})
-            _args = self.args_gen(" ".join(parts[index:]), custom_types.copy())
-        _opt = Option("|".join(aliases), _args, dest=dest, default=_default, action=action, help_text=help_text)
-        self.options.append(_opt)
+        self._add_node(parse_node_spec(name, opt, "option"), default, action, types)
         return self
 
-    def subcommand(self, name: str, opt: Optional[str] = None, default: Any = Empty) -> Self:
+    def subcommand(
+        self, name: str, opt: Optional[str] = None, default: Any = Empty, types: Optional[Mapping[str, Any]] = None
+    ) -> Self:
         """添加一个子命令
 
         name 与 opt 有四种情况:
@@ -601,30 +1454,9 @@ class AlconnaString:
             name (str): 子命令的实际名称
             opt (Optional[str], optional): 子命令的字符串, 例如 `bar <val:bool>`.
             default (Any, optional): 子命令的默认值.
+            types (Optional[Mapping[str, Any]], optional): 解析自定义类型时使用的名称表, 默认与构造时相同.
         """
-        _default = default
-        if isinstance(default, dict):
-            _default = OptionResult(args=default)
-        opt_string = name if opt is None else opt
-        help_text = None
-        if help_string := re.findall(r"(?: )?#(.+)$", opt_string):  # noqa
-            help_text = help_string[0]
-            opt_string = opt_string[: -len(help_string[0]) - 1].rstrip()
-        parts = split(opt_string, " ")
-        dest = name if opt else parts[0].lstrip("-")
-        aliases = [f"{dest}"]
-        index = 0
-        for part in parts:
-            if part.startswith("<") or part.startswith("["):
-                break
-            aliases.append(part)
-            index += 1
-        _args = Args()
-        if parts[index:]:
-            custom_types = getattr(inspect.getmodule(inspect.stack()[1][0]), "__dict__", {})
-            _args = self.args_gen(" ".join(parts[index:]), custom_types.copy())
-        _opt = Subcommand("|".join(aliases), _args, dest=dest, default=_default, help_text=help_text)
-        self.options.append(_opt)
+        self._add_node(parse_node_spec(name, opt, "subcommand"), default, types=types)
         return self
 
     def usage(self, content: str) -> Self:
@@ -698,6 +1530,125 @@ class AlconnaString:
         return alc
 
 
+SPEC_VERSION = 2
+"""命令定义格式的版本, 格式变化时递增以使旧的缓存失效"""
+
+
+class SpecCache:
+    """
+    以 JSON 文件持久化命令定义的缓存, 供短生命周期的进程跳过命令字符串的解析
+
+    每个条目以键区分, 并记录由来源与命令定义共同计算的指纹; 来源改变或定义被改动时视为过期, 重新构造并覆盖
+
+    Examples:
+        >>> cache = SpecCache("commands.json")
+        >>> alc = cache.string(
+        ...     "echo",
+        ...     lambda: AlconnaString("echo <content:str>").option("upper", "-u"),
+        ...     "echo <content:str>", "-u",
+        ... ).build()
+        >>> cache.save()
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]):
+        """
+        初始化缓存, 若文件存在且版本一致则读取其中的条目
+
+        Args:
+            path (str | PathLike[str]): 缓存文件的路径
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        with suppress(OSError, ValueError):
+            data = json.loads(self.path.read_text("utf-8"))
+            if data.get("version") == SPEC_VERSION:
+                self.entries = data["entries"]
+
+    @staticmethod
+    def fingerprint(*sources: Any) -> str:
+        """计算来源的指纹, 无法序列化的对象以其 repr 参与计算"""
+        raw = json.dumps([SPEC_VERSION, sources], default=repr, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, fingerprint: str) -> Optional[AlconnaSpec]:
+        """获取未过期的命令定义, fingerprint 为来源的指纹"""
+        entry = self.entries.get(key)
+        if entry and entry.get("fingerprint") == self.fingerprint(fingerprint, entry.get("spec")):
+            return entry["spec"]
+        return None
+
+    def set(self, key: str, fingerprint: str, spec: AlconnaSpec):
+        """写入命令定义, 需调用 `save` 才会写入文件"""
+        spec = json.loads(json.dumps(spec, ensure_ascii=False))
+        self.entries[key] = {"fingerprint": self.fingerprint(fingerprint, spec), "spec": spec}
+        self.dirty = True
+
+    def save(self):
+        """将条目写入文件; 先写入临时文件再替换, 避免并发的进程读到不完整的内容"""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temp.write_text(
+            json.dumps({"version": SPEC_VERSION, "entries": self.entries}, ensure_ascii=False), "utf-8"
+        )
+        os.replace(temp, self.path)
+        self.dirty = False
+
+    def string(
+        self,
+        key: str,
+        factory: Callable[[], AlconnaString],
+        *sources: Any,
+        types: Optional[Mapping[str, Any]] = None,
+    ) -> AlconnaString:
+        """
+        获取 AlconnaString, 缓存命中时直接从命令定义恢复, 否则调用 factory 构造并写入缓存
+
+        factory 的结果无法被完整导出时 (见 `AlconnaString.to_spec`) 不会写入缓存;
+        快捷指令与动作等应在返回值上再添加
+
+        Args:
+            key (str): 缓存键
+            factory (Callable[[], AlconnaString]): 构造 AlconnaString 的函数
+            *sources (Any): 参与指纹计算的来源, 例如命令字符串或插件文件的哈希
+            types (Optional[Mapping[str, Any]], optional): 解析自定义类型时使用的名称表, 默认为调用方模块的全局变量.
+        """
+        types = _caller_globals() if types is None else types
+        fingerprint = self.fingerprint(*sources)
+        if (spec := self.get(key, fingerprint)) is not None:
+            return AlconnaString.from_spec(spec, types)
+        builder = factory()
+        try:
+            spec = builder.to_spec()
+        except ValueError:
+            return builder
+        self.set(key, fingerprint, spec)
+        return builder
+
+    def format(
+        self,
+        key: str,
+        format_string: str,
+        format_args: Optional[Mapping[str, Union[TAValue, Args, Arg]]] = None,
+        meta: Optional[CommandMeta] = None,
+        union: bool = True,
+    ) -> Alconna:
+        """
+        以缓存的命令定义执行 `alconna_from_format`, 指纹由格式化字符串与 format_args 的键计算
+
+        format_args 中的值不会被缓存, 每次调用时都需传入
+        """
+        formats = format_args or {}
+        keys = frozenset(formats)
+        fingerprint = self.fingerprint(format_string, sorted(keys))
+        if (spec := self.get(key, fingerprint)) is None:
+            spec = spec_from_format(format_string, keys)
+            self.set(key, fingerprint, spec)
+        return _format_build(spec, formats, meta, union)
+
+
 class MountConfig(TypedDict):
     prefixes: NotRequired[List[str]]
     raise_exception: NotRequired[bool]
@@ -709,28 +1660,58 @@ class MountConfig(TypedDict):
 config_keys = ("prefixes", "raise_exception", "description", "namespace", "command")
 
 
+_config_cache: Dict[str, Tuple[int, Dict[int, MountConfig]]] = {}
+
+
+def _config_from_class(node: ast.ClassDef) -> MountConfig:
+    result: MountConfig = {}
+    for stmt in node.body:
+        if (
+            isinstance(stmt, ast.Assign)
+            and len(stmt.targets) == 1
+            and isinstance(target := stmt.targets[0], ast.Name)
+            and target.id in config_keys
+        ):
+            with suppress(ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                result[target.id] = ast.literal_eval(stmt.value)  # type: ignore
+    return result
+
+
+def _source_configs(filename: str) -> Dict[int, MountConfig]:
+    """解析源文件中所有函数内的 Config 类, 以函数的起始行号为键; 结果按文件的修改时间缓存"""
+    try:
+        mtime = os.stat(filename).st_mtime_ns
+    except OSError:
+        return {}
+    if (cached := _config_cache.get(filename)) and cached[0] == mtime:
+        return cached[1]
+    configs: Dict[int, MountConfig] = {}
+    with suppress(OSError, SyntaxError, ValueError):
+        tree = ast.parse(Path(filename).read_bytes(), filename)
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            for stmt in node.body:
+                if isinstance(stmt, ast.ClassDef) and stmt.name.endswith("Config"):
+                    lineno = min([node.lineno, *(deco.lineno for deco in node.decorator_list)])
+                    configs[lineno] = _config_from_class(stmt)
+                    break
+    _config_cache[filename] = (mtime, configs)
+    return configs
+
+
 def visit_config(obj: Any, base: Optional[MountConfig] = None) -> MountConfig:
+    """获取挂载对象的配置
+
+    函数的配置来自其内部定义的 Config 类, 通过解析源文件获取, 仅接受字面量;
+    类与对象的配置来自其名称以 Config 结尾的类属性
+    """
     result: MountConfig = base or {}
     if isinstance(obj, (FunctionType, MethodType)):
-        codes, _ = inspect.getsourcelines(obj)
-        _get_config = False
-        _start_indent = 0
-        for line in codes:
-            indent = len(line) - len(line.lstrip())
-            if line.lstrip().startswith("class") and line.lstrip().rstrip(
-                "\n"
-            ).endswith("Config:"):
-                _get_config = True
-                _start_indent = indent
-                continue
-            if _get_config:
-                if indent == _start_indent:
-                    break
-                if line.lstrip().startswith("def"):
-                    continue
-                _contents = re.split(r"\s*=\s*", line.strip())
-                if len(_contents) == 2 and _contents[0] in config_keys:
-                    result[_contents[0]] = eval(_contents[1])  # type: ignore
+        # 被 functools.wraps 装饰的函数以原函数的源码位置查找 Config
+        code = getattr(inspect.unwrap(getattr(obj, "__func__", obj)), "__code__", None)
+        if code and (config := _source_configs(code.co_filename).get(code.co_firstlineno)):
+            result.update({k: v.copy() if isinstance(v, list) else v for k, v in config.items()})  # type: ignore
     elif kss := inspect.getmembers(
         obj, lambda x: inspect.isclass(x) and x.__name__.endswith("Config")
     ):
@@ -739,36 +1720,173 @@ def visit_config(obj: Any, base: Optional[MountConfig] = None) -> MountConfig:
     return result
 
 
+_invoke_results: ContextVar[Optional[Dict[str, Any]]] = ContextVar("invoke_results", default=None)
+_invoke_instances: ContextVar[Optional[Dict[int, Any]]] = ContextVar("invoke_instances", default=None)
+"""`invoke` 时每次调用独立构造的实例, 以挂载者的 id 为键"""
+
+
+def _current_instance(owner: Any) -> Any:
+    """返回挂载者当前使用的实例; `invoke` 中优先使用本次调用构造的实例"""
+    if (instances := _invoke_instances.get()) is not None and (instance := instances.get(id(owner))) is not None:
+        return instance
+    return owner.instance
+
+
+def _inject_instance(owner: Any, target: Callable) -> Callable:
+    @wraps(target)
+    def wrapper(*args, **kwargs):
+        return target(_current_instance(owner), *args, **kwargs)
+
+    return wrapper
+
+
+@dataclass
+class _CallbackNode:
+    call: Optional[Callable] = None
+    options: Dict[str, Callable] = field(default_factory=dict)
+    subcommands: Dict[str, "_CallbackNode"] = field(default_factory=dict)
+
+
+class _CallbackOptions(Dict[str, Callable]):
+    """记录修改次数的字典, 供 CallbackHandler 判断索引是否过期"""
+
+    version: int = 0
+
+    def __setitem__(self, key: str, value: Callable):
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: str):
+        super().__delitem__(key)
+        self.version += 1
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def setdefault(self, key: str, default: Any = None):
+        self.version += 1
+        return super().setdefault(key, default)
+
+    def pop(self, key: str, *default):
+        self.version += 1
+        return super().pop(key, *default)
+
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self.version += 1
+
+
 @dataclass(unsafe_hash=True)
 class CallbackHandler(ArparmaBehavior):
+    """
+    按解析结果调用挂载的回调
+
+    options 以 `options.<dest>.args`, `subcommands.<dest>.args` 或 `subcommands.<dest>.options.<dest>.args` 等路径为键;
+    这些路径会被预先整理为以 dest 为键的索引, 分发时只遍历解析结果中实际存在的选项与子命令
+    """
     main_call: Optional[Callable] = field(default=None)
-    options: Dict[str, Callable] = field(default_factory=dict, hash=False)
+    options: Dict[str, Callable] = field(default_factory=_CallbackOptions, hash=False)
     results: Dict[str, Any] = field(default_factory=dict, hash=False)
+    requires: List[ArparmaBehavior] = field(default_factory=list, init=False, hash=False, repr=False)
+    _index: _CallbackNode = field(default_factory=_CallbackNode, init=False, hash=False, repr=False, compare=False)
+    _extra: List[Tuple[str, Callable]] = field(default_factory=list, init=False, hash=False, repr=False, compare=False)
+    _indexed: Tuple[Any, int] = field(default=(None, 0), init=False, hash=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.options = _CallbackOptions(self.options)
+
+    def _update_index(self):
+        root = _CallbackNode()
+        extra = []
+        for path, action in self.options.items():
+            parts = path.split(".")
+            node = root
+            if parts[-1] != "args" or len(parts) % 2 == 0:
+                extra.append((path, action))
+                continue
+            for index in range(0, len(parts) - 1, 2):
+                kind, dest = parts[index], parts[index + 1]
+                if kind == "subcommands":
+                    node = node.subcommands.setdefault(dest, _CallbackNode())
+                elif kind == "options" and index == len(parts) - 3:
+                    node.options[dest] = action
+                    break
+                else:
+                    extra.append((path, action))
+                    break
+            else:
+                node.call = action
+        self._index, self._extra = root, extra
+        self._indexed = (self.options, self.options.version)  # type: ignore
 
     def before_operate(self, interface: Arparma):
         super().before_operate(interface)
-        self.results.clear()
+        if _invoke_results.get() is None:
+            self.results.clear()
 
     def operate(self, interface: Arparma):
+        if (results := _invoke_results.get()) is None:
+            results = self.results
         if call := self.main_call:
             call(**interface.main_args)
-        for path, action in self.options.items():
+        # options 的任何修改都会使索引过期; 被整体替换为普通字典时重新包装
+        if not isinstance(options := self.options, _CallbackOptions):
+            options = self.options = _CallbackOptions(options)
+        if self._indexed[0] is not options or self._indexed[1] != options.version:
+            self._update_index()
+        self._dispatch(results, self._index, interface.options, interface.subcommands)
+        for path, action in self._extra:
             if (d := interface.query(path, None)) is not None:
-                self.results[action.__qualname__] = action(**d)
+                results[action.__qualname__] = action(**d)
+
+    def _dispatch(
+        self,
+        results: Dict[str, Any],
+        node: _CallbackNode,
+        options: Dict[str, OptionResult],
+        subcommands: Dict[str, Any],
+    ):
+        for dest, res in options.items():
+            if (action := node.options.get(dest)) is not None:
+                results[action.__qualname__] = action(**res.args)
+        for dest, res in subcommands.items():
+            if (sub := node.subcommands.get(dest)) is not None:
+                if sub.call:
+                    results[sub.call.__qualname__] = sub.call(**res.args)
+                self._dispatch(results, sub, res.options, res.subcommands)
+
+
+@dataclass
+class MountResult(Generic[TDC]):
+    """`invoke` 的返回值, 包含本次调用的解析结果与回调结果"""
+    arparma: Arparma[TDC]
+    results: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def matched(self) -> bool:
+        return self.arparma.matched
+
+    def get_result(self, func: Callable):
+        return self.results.get(func.__qualname__)
 
 
 class SubClassMounter(Subcommand):
     instance: Any
 
     def _get_instance(self):
-        return self.instance
+        return _current_instance(self)
 
     def _inject_instance(self, target: Callable):
-        @wraps(target)
-        def wrapper(*args, **kwargs):
-            return target(self._get_instance(), *args, **kwargs)
-
-        return wrapper
+        return _inject_instance(self, target)
 
     def __init__(self, mount_cls: Type, upper_handler: CallbackHandler, upper_path: str):
         self.mount_cls = mount_cls
@@ -782,10 +1900,12 @@ class SubClassMounter(Subcommand):
             mount_cls.__doc__ or mount_cls.__init__.__doc__ or mount_cls.__name__
         )
 
-        main_args = Args.from_callable(mount_cls.__init__)[0]
+        main_args = Args() if mount_cls.__init__ is object.__init__ else Args.from_callable(mount_cls.__init__)[0]
 
         def _main_func(**kwargs):
-            if hasattr(self, "instance"):
+            if (instances := _invoke_instances.get()) is not None:
+                instances[id(self)] = mount_cls(**kwargs)
+            elif hasattr(self, "instance"):
                 for k, v in kwargs.items():
                     setattr(self.instance, k, v)
             else:
@@ -793,7 +1913,10 @@ class SubClassMounter(Subcommand):
                 for key, value in kwargs.items():
                     self.args[key].field.default = value  # type: ignore
 
-        path = f"subcommands.{upper_path}.{mount_cls.__name__}" if upper_path else f"subcommands.{mount_cls.__name__}"
+        command = config.get("command", mount_cls.__name__)
+        # 解析结果以 dest 为键, command 可能含有别名 (如 "cls|c")
+        dest = Subcommand(command).dest
+        path = f"{upper_path}.subcommands.{dest}" if upper_path else f"subcommands.{dest}"
         upper_handler.options[f"{path}.args"] = _main_func
         for name, func in filter(lambda x: not x[0].startswith("_"), members):
             help_text = func.__doc__ or name
@@ -812,13 +1935,140 @@ class SubClassMounter(Subcommand):
         )
 
         super().__init__(
-            config.get("command", mount_cls.__name__),
+            command,
             main_args,
             *_options,
             help_text=config.get("description", main_help_text),
         )
 
 
+class _CallbackMounter(Alconna):
+    """
+    以 CallbackHandler 调用挂载成员的 Mounter 基类
+
+    `parse` 的回调结果保存在共享的 `cb_behavior.results` 中, 通过 `get_result` 读取;
+    `invoke` 则为每次调用创建独立的结果容器, 并为挂载的类独立构造实例 (`ObjectMounter` 为对象的浅拷贝),
+    不会修改共享的实例与参数默认值, 可供多个线程或协程同时使用同一个实例
+
+    `parse` 与 `invoke` 的解析过程共用同一把锁, 两者可以混合使用; `parse` 的回调也在锁内执行
+    """
+
+    cb_behavior: CallbackHandler
+
+    def __init__(self, *args, **kwargs):
+        self._lock = threading.RLock()
+        super().__init__(*args, **kwargs)
+
+    def get_result(self, func: Callable):
+        return self.cb_behavior.results.get(func.__qualname__)
+
+    def parse(self, message: TDC, ctx: Optional[Dict[str, Any]] = None) -> Arparma[TDC]:
+        with self._lock:
+            return super().parse(message, ctx)
+
+    def invoke(self, message: TDC, ctx: Optional[Dict[str, Any]] = None) -> MountResult[TDC]:
+        """解析消息并调用对应的成员, 返回本次调用独立的结果
+
+        解析过程加锁执行, 回调在锁外执行
+
+        Args:
+            message (TDC): 命令消息
+            ctx (Optional[Dict[str, Any]], optional): 上下文信息
+        """
+        with self._lock:
+            try:
+                arp = self._parse(message, ctx)
+            except NullMessage as e:
+                if self.meta.raise_exception:
+                    raise e
+                return MountResult(Arparma(self._hash, message, False, error_info=e, ctx=ctx))
+        result = MountResult(arp)
+        if arp.matched:
+            token = _invoke_results.set(result.results)
+            instances = _invoke_instances.set({})
+            try:
+                result.arparma = arp.execute(self.behaviors)
+            finally:
+                _invoke_instances.reset(instances)
+                _invoke_results.reset(token)
+        return result
+
+
+class _LazyMounter(_CallbackMounter):
+    """
+    延迟挂载的 Mounter 基类
+
+    构造时仅记录成员名与对应的构造函数, 解析时按消息中出现的成员名 (含别名与紧随参数的紧凑形式) 构造对应的 Option 或 SubClassMounter;
+    生成帮助信息或使用内置选项时构造全部成员
+
+    每次构造都需要重新编译命令, 因此解析时除命中的成员外, 还会额外构造不少于已构造数量的成员, 使编译次数随成员数量对数增长
+    """
+
+    _pending: Dict[str, Callable[[], Union[Option, Subcommand]]]
+    _triggers: Dict[str, str]
+    _mounted: int
+
+    def _setup_members(self, members: List[Tuple[str, Callable[[], Union[Option, Subcommand]]]], lazy: bool):
+        self._mounted = 0
+        if lazy:
+            self._pending = dict(members)
+            self._triggers = {alias: name for name in self._pending for alias in name.split("|")}
+            return []
+        self._pending, self._triggers = {}, {}
+        return [builder() for _, builder in members]
+
+    def mount(self, *names: str) -> Self:
+        """立即构造指定的成员, 不传入时构造全部尚未构造的成员"""
+        self._mount(names or tuple(self._pending))
+        return self
+
+    def _mount(self, names: Iterable[str], batch: bool = False):
+        with self._lock:
+            pending = self._pending
+            names = [name for name in dict.fromkeys(names) if name in pending]
+            if not names:
+                return
+            if batch and (extra := self._mounted):
+                names.extend(islice((name for name in pending if name not in names), extra))
+            builders = [pending.pop(name) for name in names]
+            for name in names:
+                for alias in name.split("|"):
+                    self._triggers.pop(alias, None)
+            self._mounted += len(builders)
+            with command_manager.update(self):
+                self.options.extend(builder() for builder in builders)
+
+    def _hits(self, tokens: Iterable[str]) -> List[str]:
+        triggers = self._triggers
+        hits = []
+        for token in tokens:
+            if (name := triggers.get(token)) is not None:
+                hits.append(name)
+                continue
+            # 紧凑形式: 成员名后紧跟参数, 例如 `talk=Friend`
+            for end in range(len(token) - 1, 0, -1):
+                if (name := triggers.get(token[:end])) is not None:
+                    hits.append(name)
+                    break
+        return hits
+
+    def _parse(self, message: TDC, ctx: Optional[Dict[str, Any]] = None) -> Arparma[TDC]:
+        if self._pending:
+            tokens = set()
+            for part in [message] if isinstance(message, str) else message:  # type: ignore
+                if isinstance(part, str):
+                    tokens.update(part.split())
+            if tokens & set().union(*self.namespace_config.builtin_option_name.values()):
+                self._mount(tuple(self._pending))
+            elif hits := self._hits(tokens):
+                self._mount(hits, batch=True)
+        return super()._parse(message, ctx)
+
+    def get_help(self) -> str:
+        self.mount()
+        return super().get_help()
+
+
 class FuncMounter(Alconna[TDC], Generic[T, TDC]):
     def __init__(
         self, func: Callable[..., T], config: Optional[MountConfig] = None
@@ -848,38 +2098,35 @@ class FuncMounter(Alconna[TDC], Generic[T, TDC]):
         return {ext.target.__name__: res for ext, res in self._executors.items() if res is not None}
 
 
-class ModuleMounter(Alconna):
-    def __init__(self, module: ModuleType, config: Optional[MountConfig] = None):
+class ModuleMounter(_LazyMounter):
+    def __init__(self, module: ModuleType, config: Optional[MountConfig] = None, lazy: bool = False):
+        """
+        Args:
+            module (ModuleType): 挂载的模块
+            config (Optional[MountConfig]): 挂载配置
+            lazy (bool): 是否延迟构造成员对应的选项与子命令
+        """
         self.mount_cls = module.__class__
         self.instance = module
         config = config or visit_config(module, config)
-        _options = []
         members = inspect.getmembers(
             module, lambda x: inspect.isfunction(x) or inspect.ismethod(x)
         )
         self.cb_behavior = CallbackHandler()
-        for name, func in members:
-            if name.startswith("_") or func.__name__.startswith("_"):
-                continue
-            help_text = func.__doc__ or name
-            _opt_args, method = Args.from_callable(func)
-            if method:
-                func = partial(func, func.__self__)
-            _options.append(
-                Option(
-                    name, args=_opt_args, help_text=help_text
-                )
-            )
-            self.cb_behavior.options[f"options.{name}.args"] = func
-        _options.extend(
-            SubClassMounter(cls, self.cb_behavior, "")
+        _members = [
+            (name, partial(self._mount_func, name, func))
+            for name, func in members
+            if not name.startswith("_") and not func.__name__.startswith("_")
+        ]
+        _members.extend(
+            (visit_config(cls).get("command", cls.__name__), partial(SubClassMounter, cls, self.cb_behavior, ""))
             for name, cls in inspect.getmembers(module, inspect.isclass)
             if not name.startswith("_") and not name.endswith("Config")
         )
         super().__init__(
             config.get("command", module.__name__),
             config.get("prefixes", []),
-            *_options,
+            *self._setup_members(_members, lazy),
             namespace=config.get("namespace", None),
             meta=CommandMeta(
                 description=config.get(
@@ -890,40 +2137,48 @@ class ModuleMounter(Alconna):
             behaviors=[self.cb_behavior],
         )
 
-    def get_result(self, func: Callable):
-        return self.cb_behavior.results.get(func.__qualname__)
+    def _mount_func(self, name: str, func: Callable) -> Option:
+        help_text = func.__doc__ or name
+        _opt_args, method = Args.from_callable(func)
+        if method:
+            func = partial(func, func.__self__)
+        self.cb_behavior.options[f"options.{name}.args"] = func
+        return Option(name, args=_opt_args, help_text=help_text)
 
 
-class ClassMounter(Alconna[TDC], Generic[T, TDC]):
+class ClassMounter(_LazyMounter, Alconna[TDC], Generic[T, TDC]):
     mount_cls: Type[T]
     instance: T
 
     def _get_instance(self) -> T:
-        return self.instance
+        return _current_instance(self)
 
     def _inject_instance(self, target: Callable):
-        @wraps(target)
-        def wrapper(*args, **kwargs):
-            return target(self._get_instance(), *args, **kwargs)
-
-        return wrapper
+        return _inject_instance(self, target)
 
-    def __init__(self, mount_cls: Type[T], config: Optional[MountConfig] = None):
+    def __init__(self, mount_cls: Type[T], config: Optional[MountConfig] = None, lazy: bool = False):
+        """
+        Args:
+            mount_cls (Type[T]): 挂载的类
+            config (Optional[MountConfig]): 挂载配置
+            lazy (bool): 是否延迟构造成员对应的选项与子命令
+        """
         self.mount_cls = mount_cls
         config = config or visit_config(mount_cls, config)
         members = inspect.getmembers(
             mount_cls, lambda x: inspect.isfunction(x) or inspect.ismethod(x)
         )
 
-        _options = []
         main_help_text = (
             mount_cls.__doc__ or mount_cls.__init__.__doc__ or mount_cls.__name__
         )
 
-        main_args = Args.from_callable(mount_cls.__init__)[0]
+        main_args = Args() if mount_cls.__init__ is object.__init__ else Args.from_callable(mount_cls.__init__)[0]
 
         def _main_func(**kwargs):
-            if hasattr(self, "instance"):
+            if (instances := _invoke_instances.get()) is not None:
+                instances[id(self)] = mount_cls(**kwargs)
+            elif hasattr(self, "instance"):
                 for k, v in kwargs.items():
                     setattr(self.instance, k, v)
             else:
@@ -932,18 +2187,13 @@ class ClassMounter(Alconna[TDC], Generic[T, TDC]):
                     self.args[key].field.default = value  # type: ignore
 
         self.cb_behavior = CallbackHandler(main_call=_main_func)
-        for name, func in filter(lambda x: not x[0].startswith("_"), members):
-            help_text = func.__doc__ or name
-            _opt_args, method = Args.from_callable(func)
-            if method:
-                func = self._inject_instance(func)
-            _options.append(
-                Option(name, _opt_args, help_text=help_text)
-            )
-            self.cb_behavior.options[f"options.{name}.args"] = func
-
-        _options.extend(
-            SubClassMounter(cls, self.cb_behavior, "")
+        _members = [
+            (name, partial(self._mount_func, name, func))
+            for name, func in members
+            if not name.startswith("_")
+        ]
+        _members.extend(
+            (visit_config(cls).get("command", cls.__name__), partial(SubClassMounter, cls, self.cb_behavior, ""))
             for name, cls in inspect.getmembers(mount_cls, inspect.isclass)
             if not name.startswith("_") and not name.endswith("Config")
         )
@@ -951,7 +2201,7 @@ class ClassMounter(Alconna[TDC], Generic[T, TDC]):
             config.get("command", mount_cls.__name__),
             main_args,
             config.get("prefixes", []),
-            *_options,
+            *self._setup_members(_members, lazy),
             namespace=config.get("namespace", None),
             meta=CommandMeta(
                 description=config.get("description", main_help_text),
@@ -960,11 +2210,16 @@ class ClassMounter(Alconna[TDC], Generic[T, TDC]):
             behaviors=[self.cb_behavior],
         )
 
-    def get_result(self, func: Callable):
-        return self.cb_behavior.results.get(func.__qualname__)
+    def _mount_func(self, name: str, func: Callable) -> Option:
+        help_text = func.__doc__ or name
+        _opt_args, method = Args.from_callable(func)
+        if method:
+            func = self._inject_instance(func)
+        self.cb_behavior.options[f"options.{name}.args"] = func
+        return Option(name, _opt_args, help_text=help_text)
 
 
-class ObjectMounter(Alconna[TDC], Generic[T, TDC]):
+class ObjectMounter(_CallbackMounter, Alconna[TDC], Generic[T, TDC]):
     mount_cls: Type[T]
     instance: T
 
@@ -980,14 +2235,20 @@ class ObjectMounter(Alconna[TDC], Generic[T, TDC]):
         main_help_text = obj.__doc__ or obj.__init__.__doc__ or obj_name
 
         def _main_func(**kwargs):
+            if (instances := _invoke_instances.get()) is not None:
+                instance = instances[id(self)] = copy(self.instance)
+            else:
+                instance = self.instance
             for k, v in kwargs.items():
-                setattr(self.instance, k, v)
+                setattr(instance, k, v)
 
         self.cb_behavior = CallbackHandler(main_call=_main_func)
 
         for name, func in filter(lambda x: not x[0].startswith("_"), members):
             help_text = func.__doc__ or name
             _opt_args, _ = Args.from_callable(func)
+            if inspect.ismethod(func) and func.__self__ is obj:
+                func = _inject_instance(self, func.__func__)
             _options.append(
                 Option(
                     name, args=_opt_args, help_text=help_text
@@ -1018,20 +2279,17 @@ class ObjectMounter(Alconna[TDC], Generic[T, TDC]):
             namespace=config.get("namespace", None),
         )
 
-    def get_result(self, func: Callable):
-        return self.cb_behavior.results.get(func.__qualname__)
-
 
 @overload
 def alconna_from_object(  # type: ignore
-    target: ModuleType, command: Optional[TDC] = None, config: Optional[MountConfig] = None,
+    target: ModuleType, command: Optional[TDC] = None, config: Optional[MountConfig] = None, lazy: bool = False,
 ) -> ModuleMounter:
     ...
 
 
 @overload
 def alconna_from_object(  # type: ignore
-    target: Type[T], command: Optional[TDC] = None, config: Optional[MountConfig] = None,
+    target: Type[T], command: Optional[TDC] = None, config: Optional[MountConfig] = None, lazy: bool = False,
 ) -> ClassMounter[T, TDC]:
     ...
 
@@ -1054,6 +2312,7 @@ def alconna_from_object(  # type: ignore
     target: Optional[Union[Type[T], T, Callable[..., T], ModuleType]] = None,
     command: Optional[TDC] = None,
     config: Optional[MountConfig] = None,
+    lazy: bool = False,
 ) -> Union[
     ModuleMounter,
     ClassMounter[T, TDC],
@@ -1063,6 +2322,8 @@ def alconna_from_object(  # type: ignore
     """
     通过解析传入的对象，生成 Alconna 实例的方法, 或者说是Fire-like的方式
 
+    lazy 为 True 时, 模块与类的成员在首次解析到或生成帮助信息时才会构造, 适用于成员较多的情况
+
     Examples:
 
         >>> def test_func(a, b, c):
@@ -1074,14 +2335,14 @@ def alconna_from_object(  # type: ignore
     if inspect.isfunction(target) or inspect.ismethod(target):
         r = FuncMounter(target, config)
     elif inspect.isclass(target):
-        r = ClassMounter(target, config)
+        r = ClassMounter(target, config, lazy)
     elif inspect.ismodule(target):
-        r = ModuleMounter(target, config)
+        r = ModuleMounter(target, config, lazy)
     elif target:
         r = ObjectMounter(target, config)
     else:
         r = ModuleMounter(
-            inspect.getmodule(inspect.stack()[1][0]) or sys.modules["__main__"], config
+            sys.modules.get(_caller_globals().get("__name__", "__main__")) or sys.modules["__main__"], config, lazy
         )
     command = command or (" ".join(sys.argv[1:]) if len(sys.argv) > 1 else None)  # type: ignore
     if command:
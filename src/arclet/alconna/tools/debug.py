@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import traceback
-from collections import namedtuple
-from typing import Any, Literal
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Any, Generic, Literal, TypeVar, overload
 
-from arclet.alconna._internal._analyser import Analyser, default_compiler
+from arclet.alconna._internal._analyser import SubAnalyser, default_compiler
 from arclet.alconna._internal._handlers import analyse_args as ala
 from arclet.alconna._internal._handlers import HEAD_HANDLES
 from arclet.alconna._internal._handlers import analyse_option as alo
@@ -13,8 +14,11 @@ from arclet.alconna.args import Args
 from arclet.alconna.argv import Argv
 from arclet.alconna.base import Option, Subcommand
 from arclet.alconna.config import Namespace
+from arclet.alconna.constraint import ARGV_OVERRIDES
 from arclet.alconna.typing import DataCollection, CommandMeta
 
+T = TypeVar("T")
+
 
 class AnalyseError(Exception):
     """分析时发生错误"""
@@ -23,19 +27,12 @@ class AnalyseError(Exception):
 dev_space = Namespace("devtool", enable_message_cache=False)
 
 
-class _DummyAnalyser(Analyser):
-    filter_out = []
-
-    class _DummyALC:
-        options = []
-        meta = namedtuple("Meta", ["keep_crlf", "fuzzy_match", "raise_exception"])(False, False, True)
-        namespace_config = dev_space
+class _DummyAnalyser(SubAnalyser):
+    """以一个虚拟的子命令包裹目标节点并编译, 编译结果与解析状态均只保存在实例上"""
 
-    def __new__(cls, *args, **kwargs):
-        cls.command = cls._DummyALC()  # type: ignore
-        cls.compile_params = {}
-        cls.compact_params = []
-        return super().__new__(cls)
+    def __init__(self, node: Option | Subcommand, param_ids: set[str]):
+        super().__init__(Subcommand("devtool", node))
+        default_compiler(self, param_ids)
 
 
 def analyse_args(
@@ -88,24 +85,7 @@ def analyse_option(
     context_style: Literal["bracket", "parentheses"] | None = None,
     **kwargs
 ):
-    meta = CommandMeta(keep_crlf=False, fuzzy_match=False, raise_exception=raise_exception, context_style=context_style)
-    argv = Argv(meta, dev_space)
-    _analyser = _DummyAnalyser.__new__(_DummyAnalyser)
-    _analyser.reset()
-    _analyser.command.separators = " "
-    _analyser.need_main_args = False
-    _analyser.command.options.append(option)
-    default_compiler(_analyser, argv.param_ids)
-    _analyser.command.options.clear()
-    try:
-        argv.enter(kwargs)
-        argv.build(command)
-        alo(_analyser, argv, option)
-        return _analyser.options_result[option.dest]
-    except Exception as e:
-        if raise_exception:
-            traceback.print_exception(AnalyseError, e, e.__traceback__)
-        return
+    return prepare(option, raise_exception, context_style)(command, **kwargs)
 
 
 def analyse_subcommand(
@@ -115,20 +95,190 @@ def analyse_subcommand(
     context_style: Literal["bracket", "parentheses"] | None = None,
     **kwargs
 ):
-    meta = CommandMeta(keep_crlf=False, fuzzy_match=False, raise_exception=raise_exception, context_style=context_style)
-    argv = Argv(meta, dev_space)
-    _analyser = _DummyAnalyser.__new__(_DummyAnalyser)
-    _analyser.reset()
-    _analyser.command.separators = " "
-    _analyser.need_main_args = False
-    _analyser.command.options.append(subcommand)
-    default_compiler(_analyser, argv.param_ids)
-    _analyser.command.options.clear()
-    try:
-        argv.enter(kwargs)
-        argv.build(command)
-        return _analyser.compile_params[subcommand.name].process(argv).result()  # type: ignore
-    except Exception as e:
-        if raise_exception:
+    return prepare(subcommand, raise_exception, context_style)(command, **kwargs)
+
+
+class _PreparedAnalyser(ABC, Generic[T]):
+    """
+    预编译的分析器基类
+
+    目标只在创建时编译一次; 每次调用从对象池中取出一组 Argv 与解析器状态, 用完后归还, 可以被多个线程同时调用
+    """
+
+    def __init__(
+        self,
+        raise_exception: bool = True,
+        context_style: Literal["bracket", "parentheses"] | None = None,
+        separators: str = " ",
+        pool_size: int = 16,
+    ):
+        self.raise_exception = raise_exception
+        self.meta = CommandMeta(
+            keep_crlf=False, fuzzy_match=False, raise_exception=raise_exception, context_style=context_style
+        )
+        self.separators = separators
+        self.pool_size = pool_size
+        self._pool: list[tuple[Argv, Any]] = []
+        self._lock = Lock()
+
+    def _create(self) -> tuple[Argv, Any]:
+        return Argv(self.meta, dev_space, separators=self.separators), None
+
+    @abstractmethod
+    def _analyse(self, argv: Argv, state: Any, command: DataCollection[str | Any]) -> T:
+        """使用取出的 Argv 与解析器状态分析命令"""
+
+    def _failed(self) -> T | None:
+        return None
+
+    def _error(self, e: Exception) -> T | None:
+        if self.raise_exception:
             traceback.print_exception(AnalyseError, e, e.__traceback__)
-        return
+        return self._failed()
+
+    def _acquire(self) -> tuple[Argv, Any]:
+        with self._lock:
+            if self._pool:
+                return self._pool.pop()
+        return self._create()
+
+    def _release(self, ctx: tuple[Argv, Any]):
+        with self._lock:
+            if len(self._pool) < self.pool_size:
+                self._pool.append(ctx)
+
+    def __call__(self, command: DataCollection[str | Any], **kwargs) -> T | None:
+        ctx = self._acquire()
+        argv, state = ctx
+        try:
+            argv.enter(kwargs)
+            return self._analyse(argv, state, command)
+        except Exception as e:
+            return self._error(e)
+        finally:
+            argv.exit()
+            # ARGV_OVERRIDES 会直接修改 Argv 的属性, 这样的实例不再放回池中
+            if ARGV_OVERRIDES not in kwargs:
+                self._release(ctx)
+
+
+class PreparedArgs(_PreparedAnalyser[dict[str, Any]]):
+    """预编译的 `Args` 分析器, 结果同 `analyse_args`"""
+
+    def __init__(self, args: Args, raise_exception: bool = True, context_style: Literal["bracket", "parentheses"] | None = None):
+        super().__init__(raise_exception, context_style)
+        self.args = args
+
+    def _analyse(self, argv: Argv, state: None, command: list[str | Any]):
+        argv.build(["test", *command])
+        argv.next()
+        return ala(argv, self.args)
+
+    def _failed(self):
+        return {}
+
+
+class PreparedHeader(_PreparedAnalyser[Any]):
+    """预编译的命令头分析器, 结果同 `analyse_header`"""
+
+    def __init__(
+        self,
+        headers: list[str | Any] | list[tuple[Any, str]],
+        command_name: str,
+        sep: str = " ",
+        compact: bool = False,
+        raise_exception: bool = True,
+        context_style: Literal["bracket", "parentheses"] | None = None,
+    ):
+        super().__init__(raise_exception, context_style, sep)
+        self.header = Header.generate(command_name, headers, compact=compact)
+        self.handler = HEAD_HANDLES[self.header.flag]
+
+    def _analyse(self, argv: Argv, state: None, command: DataCollection[str | Any]):
+        argv.build(command)
+        return self.handler(self.header, argv)
+
+
+class PreparedOption(_PreparedAnalyser[Any]):
+    """预编译的 `Option` 分析器, 结果同 `analyse_option`"""
+
+    def __init__(self, option: Option, raise_exception: bool = True, context_style: Literal["bracket", "parentheses"] | None = None):
+        super().__init__(raise_exception, context_style)
+        self.option = option
+
+    def _create(self):
+        argv, _ = super()._create()
+        return argv, _DummyAnalyser(self.option, argv.param_ids)
+
+    def _analyse(self, argv: Argv, state: _DummyAnalyser, command: DataCollection[str | Any]):
+        argv.build(command)
+        try:
+            alo(state, argv, self.option)
+            return state.options_result[self.option.dest]
+        finally:
+            state.reset()
+
+
+class PreparedSubcommand(_PreparedAnalyser[Any]):
+    """预编译的 `Subcommand` 分析器, 结果同 `analyse_subcommand`"""
+
+    def __init__(
+        self, subcommand: Subcommand, raise_exception: bool = True, context_style: Literal["bracket", "parentheses"] | None = None
+    ):
+        super().__init__(raise_exception, context_style)
+        self.subcommand = subcommand
+
+    def _create(self):
+        argv, _ = super()._create()
+        return argv, _DummyAnalyser(self.subcommand, argv.param_ids).compile_params[self.subcommand.name]
+
+    def _analyse(self, argv: Argv, state: SubAnalyser, command: DataCollection[str | Any]):
+        argv.build(command)
+        try:
+            return state.process(argv).result()
+        except Exception:
+            state.reset()
+            raise
+
+
+@overload
+def prepare(
+    target: Args, raise_exception: bool = True, context_style: Literal["bracket", "parentheses"] | None = None
+) -> PreparedArgs:
+    ...
+
+
+@overload
+def prepare(
+    target: Subcommand, raise_exception: bool = True, context_style: Literal["bracket", "parentheses"] | None = None
+) -> PreparedSubcommand:
+    ...
+
+
+@overload
+def prepare(
+    target: Option, raise_exception: bool = True, context_style: Literal["bracket", "parentheses"] | None = None
+) -> PreparedOption:
+    ...
+
+
+def prepare(
+    target: Args | Option | Subcommand,
+    raise_exception: bool = True,
+    context_style: Literal["bracket", "parentheses"] | None = None,
+):
+    """
+    预编译目标, 返回可重复调用的分析器
+
+    Examples:
+        >>> opt = prepare(Option("--foo", Args["bar", int]))
+        >>> opt(["--foo", "123"])
+        (value=None args={'bar': 123})
+    """
+    if isinstance(target, Args):
+        return PreparedArgs(target, raise_exception, context_style)
+    if isinstance(target, Subcommand):
+        return PreparedSubcommand(target, raise_exception, context_style)
+    if isinstance(target, Option):
+        return PreparedOption(target, raise_exception, context_style)
+    raise TypeError(target)
@@ -1,4 +1,7 @@
-from typing import List, Union, Tuple, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, List, Union, Tuple, Optional
+from unicodedata import combining, east_asian_width
 from nepattern import Empty, ANY, AnyString
 from tarina import lang
 from arclet.alconna import AllParam
@@ -6,14 +9,222 @@ from arclet.alconna.args import Args, Arg
 from arclet.alconna.base import Subcommand, Option, Shortcut, Completion
 from arclet.alconna.formatter import TextFormatter, Trace, TraceHead
 import shutil
+import signal
+import threading
 
 
-def get_terminal_size():
-    size = shutil.get_terminal_size(fallback=(80, 24))
-    return size.columns
+_terminal_width: Optional[int] = None
+_resize_handler: Optional[Callable] = None
 
 
-class ShellTextFormatter(TextFormatter):
+def _watch_resize() -> bool:
+    """
+    注册 SIGWINCH 处理函数, 终端尺寸变化时使缓存的宽度失效, 原有的处理函数仍会被调用
+
+    平台不支持 SIGWINCH, 不在主线程中, 或处理函数已被替换时返回 False
+    """
+    global _resize_handler
+    if _resize_handler is not None:
+        return signal.getsignal(signal.SIGWINCH) is _resize_handler
+    if not hasattr(signal, "SIGWINCH") or threading.current_thread() is not threading.main_thread():
+        return False
+    previous = signal.getsignal(signal.SIGWINCH)
+
+    def handler(signum, frame):
+        global _terminal_width
+        _terminal_width = None
+        if callable(previous):
+            previous(signum, frame)
+
+    try:
+        signal.signal(signal.SIGWINCH, handler)
+    except (ValueError, OSError):
+        return False
+    _resize_handler = handler
+    return True
+
+
+def get_terminal_size(refresh: bool = False) -> int:
+    """
+    返回终端宽度
+
+    能监听 SIGWINCH 时缓存结果, 并在终端尺寸变化时重新查询; 否则每次调用都重新查询
+    """
+    global _terminal_width
+    if refresh or not _watch_resize() or _terminal_width is None:
+        _terminal_width = shutil.get_terminal_size(fallback=(80, 24)).columns
+    return _terminal_width
+
+
+@lru_cache(None)
+def _char_width(char: str) -> int:
+    if combining(char):
+        return 0
+    return 2 if east_asian_width(char) in ("W", "F") else 1
+
+
+@lru_cache(4096)
+def display_width(text: str) -> int:
+    """文本在终端中的显示宽度, 东亚宽字符计为 2"""
+    if text.isascii():
+        return len(text)
+    return sum(map(_char_width, text))
+
+
+@lru_cache(4096)
+def wrap_text(text: str, width: int) -> Tuple[str, ...]:
+    """按显示宽度将文本切分为多行, 每行不超过 width (单个字符超宽时独占一行)"""
+    lines = []
+    for line in text.split("\n"):
+        if display_width(line) <= width:
+            lines.append(line)
+        elif line.isascii():
+            lines.extend(line[i:i + width] for i in range(0, len(line), width))
+        else:
+            start, used = 0, 0
+            for index, size in enumerate(map(_char_width, line)):
+                if used + size > width and index > start:
+                    lines.append(line[start:index])
+                    start, used = index, 0
+                used += size
+            lines.append(line[start:])
+    return tuple(lines)
+
+
+def layout_columns(
+    rows: List[Tuple[str, str]], width: int, column: int, style: Callable[[str], str] = lambda text: text
+) -> List[str]:
+    """
+    将 (名称, 帮助文本) 排版为两列
+
+    名称超出 column - 2 时帮助文本另起一行; 帮助文本按剩余宽度折行并对齐到第二列
+
+    Args:
+        rows: (名称, 帮助文本) 列表
+        width: 总宽度
+        column: 第二列的起始位置
+        style: 对名称部分的修饰, 不计入宽度
+    """
+    indent = "\n" + " " * column
+    help_width = max(width - column, 1)
+    result = []
+    for text, help_text in rows:
+        help_text = indent.join(wrap_text(help_text, help_width))
+        size = display_width(text)
+        if size > column - 2:
+            result.append(f"{style(text)}{indent}{help_text}")
+        else:
+            result.append(f"{style(text)}{' ' * (column - size)}{help_text}")
+    return result
+
+
+class _CachedTextFormatter(TextFormatter):
+    """
+    带有渲染缓存的帮助文本格式化器
+
+    以命令的结构哈希, 查询的节点路径, 当前语言与 (需要时) 终端宽度为键缓存 `format_node` 的结果;
+    命令被添加, 移除或更新时清空缓存
+    """
+
+    cache_size: int = 256
+    width_aware: bool = False
+
+    def __init__(self):
+        super().__init__()
+        self.cache: "OrderedDict[Hashable, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _invalidate(self):
+        self.cache.clear()
+
+    def add(self, base):
+        self._invalidate()
+        return super().add(base)
+
+    def update_shortcut(self, base):
+        self._invalidate()
+        return super().update_shortcut(base)
+
+    def remove(self, base):
+        self._invalidate()
+        return super().remove(base)
+
+    def format_node(self, parts: Optional[list] = None):
+        key = (
+            tuple(self.data),
+            tuple(parts) if parts else (),
+            lang.current,
+            get_terminal_size() if self.width_aware else 0,
+        )
+        if (res := self.cache.get(key)) is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return res
+        self.misses += 1
+        res = self.cache[key] = super().format_node(parts)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return res
+
+    def cache_info(self) -> Dict[str, int]:
+        """返回缓存的命中次数, 未命中次数与当前大小"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.cache)}
+
+    def cache_clear(self):
+        """清空缓存与计数"""
+        self.cache.clear()
+        self.hits = self.misses = 0
+
+
+class _ColumnTextFormatter(_CachedTextFormatter):
+    """以两列排版选项与子命令的格式化器, `column_width` 为帮助文本所在列的起始位置"""
+
+    width_aware = True
+    column_width: int = 24
+
+    def __init__(self):
+        super().__init__()
+        # 节点以结构哈希比较, 其参数与名称文本在命令变化前保持不变
+        self.node_texts: Dict[Union[Option, Subcommand], Tuple[str, str]] = {}
+
+    def _invalidate(self):
+        super()._invalidate()
+        self.node_texts.clear()
+
+    def _texts(self, node: Union[Option, Subcommand]) -> Tuple[str, str]:
+        """返回节点的参数文本与第一列文本"""
+        if (res := self.node_texts.get(node)) is None:
+            if len(self.node_texts) >= 4096:
+                self.node_texts.clear()
+            params = self.parameters(node.args, show_notice=False)  # type: ignore
+            name = (f'{{{" ".join(node.requires)}}} ' if node.requires else "") + ", ".join(sorted(node.aliases, key=len))
+            res = self.node_texts[node] = (params, f"  {name}{tuple(node.separators)[0]}{params}")
+        return res
+
+    def _node_text(self, node: Union[Option, Subcommand]) -> str:
+        return self._texts(node)[1]
+
+    def _columns(
+        self, parts: List[Union[Option, Subcommand]], style: Callable[[str], str] = lambda text: text
+    ) -> Tuple[List[str], List[str]]:
+        """返回排版后的选项与子命令"""
+        width = get_terminal_size()
+        options = layout_columns(
+            [
+                (self._node_text(opt), opt.help_text)
+                for opt in parts if isinstance(opt, Option) and not isinstance(opt, (Completion, Shortcut))
+            ],
+            width, self.column_width, style,
+        )
+        subcommands = layout_columns(
+            [(self._node_text(sub), sub.help_text) for sub in parts if isinstance(sub, Subcommand)],
+            width, self.column_width, style,
+        )
+        return options, subcommands
+
+
+class ShellTextFormatter(_ColumnTextFormatter):
     """
     shell 风格的帮助文本格式化器
     """
@@ -23,7 +234,7 @@ class ShellTextFormatter(TextFormatter):
         sub_names = [i.name for i in parts if isinstance(i, Subcommand)]
         sub_names = " ..." if sub_names else ""
         opts = {min(i.aliases, key=len): i for i in parts if isinstance(i, Option) and i.name not in self.ignore_names}
-        opt_names = " ".join((f"[{n}]" if opt.args.empty else f"[{n} {self.parameters(opt.args, show_notice=False)}]") for n, opt in opts.items()) if opts else ""
+        opt_names = " ".join((f"[{n}]" if opt.args.empty else f"[{n} {self._texts(opt)[0]}]") for n, opt in opts.items()) if opts else ""
         topic = f"{lang.require('tools', 'format.ap.title')}: {trace.head['name']} {opt_names}{sub_names}"
         title, desc, usage, example = self.header(trace.head)
         param = self.parameters(trace.args)
@@ -80,35 +291,7 @@ class ShellTextFormatter(TextFormatter):
         return root["name"], help_string, usage, example
 
     def body(self, parts: List[Union[Option, Subcommand]]) -> str:
-        options = []
-        width = get_terminal_size()
-        # max_len = 1
-        for opt in (i for i in parts if isinstance(i, Option) and not isinstance(i, (Completion, Shortcut))):
-            name = (f'{{{" ".join(opt.requires)}}} ' if opt.requires else "") + ", ".join(sorted(opt.aliases, key=len))
-            text = f"  {name}{tuple(opt.separators)[0]}{self.parameters(opt.args, show_notice=False)}"
-            help_text = opt.help_text
-            if len(help_text) + 24 > width:
-                _prts = [help_text[i:i + (width - 24)] for i in range(0, len(help_text), width - 24)]
-                help_text = f"\n{' ' * 24}".join(_prts)
-            if len(text) > 22:
-                text += f"\n{' ' * 24}{help_text}"
-            else:
-                text += f"{' ' * (24 - len(text))}{help_text}"
-            options.append(text)
-        subcommands = []
-        for sub in (i for i in parts if isinstance(i, Subcommand)):
-            name = (f'{{{" ".join(sub.requires)}}} ' if sub.requires else "") + ", ".join(sorted(sub.aliases, key=len))
-            args = self.parameters(sub.args, show_notice=False)
-            text = f"  {name}{tuple(sub.separators)[0]}{args}"
-            help_text = sub.help_text
-            if len(help_text) + 24 > width:
-                _prts = [help_text[i:i + (width - 24)] for i in range(0, len(help_text), width - 24)]
-                help_text = f"\n{' ' * 24}".join(_prts)
-            if len(text) > 22:
-                text += f"\n{' ' * 24}{help_text}"
-            else:
-                text += f"{' ' * (24 - len(text))}{help_text}"
-            subcommands.append(text)
+        options, subcommands = self._columns(parts)
         option_string = "\n".join(options)
         subcommand_string = "\n".join(subcommands)
         option_help = f"{lang.require('tools', 'format.ap.opt')}:\n{option_string}\n" if option_string else ""
@@ -116,7 +299,7 @@ class ShellTextFormatter(TextFormatter):
         return f"{subcommand_help}{option_help}"
 
 
-class MarkdownTextFormatter(TextFormatter):
+class MarkdownTextFormatter(_CachedTextFormatter):
     def format(self, trace: Trace) -> str:
         """help text的生成入口"""
         """头部节点的描述"""
@@ -242,7 +425,7 @@ color_theme = {
 }
 
 
-class _RichTextFormatter(TextFormatter):
+class _RichTextFormatter(_ColumnTextFormatter):
     csl_code: bool
 
     def _convert(self, content: str, style: str):
@@ -258,7 +441,7 @@ class _RichTextFormatter(TextFormatter):
         sub_names = [i.name for i in parts if isinstance(i, Subcommand)]
         sub_names = self._convert(" ...", "info") if sub_names else ""
         opts = {min(i.aliases, key=len): i for i in parts if isinstance(i, Option) and i.name not in self.ignore_names}
-        opt_names = self._convert(" ".join(f"[{n}]" if opt.args.empty else f"[{n} {self.parameters(opt.args, show_notice=False)}]" for n, opt in opts.items()), "info") if opts else ""
+        opt_names = self._convert(" ".join(f"[{n}]" if opt.args.empty else f"[{n} {self._texts(opt)[0]}]" for n, opt in opts.items()), "info") if opts else ""
         title = f"{lang.require('tools', 'format.ap.title')}:"
         topic = f"{self._convert(title, 'warn')} {self._convert(trace.head['name'], 'msg')} {opt_names}{sub_names}"
         cmd, desc, usage, example = self.header(trace.head)
@@ -322,41 +505,7 @@ class _RichTextFormatter(TextFormatter):
         return command_string, help_string, usage, example
 
     def body(self, parts: List[Union[Option, Subcommand]]) -> str:
-        options = []
-        width = get_terminal_size()
-        # max_len = 1
-        for opt in (i for i in parts if isinstance(i, Option) and not isinstance(i, (Completion, Shortcut))):
-            name = (f'{{{" ".join(opt.requires)}}} ' if opt.requires else "") + ", ".join(sorted(opt.aliases, key=len))
-            text = f"  {name}{tuple(opt.separators)[0]}{self.parameters(opt.args, show_notice=False)}"
-            help_text = opt.help_text
-            if len(help_text) + 24 > width:
-                _prts = [help_text[i:i + (width - 24)] for i in range(0, len(help_text), width - 24)]
-                help_text = f"\n{' ' * 24}".join(_prts)
-            if len(text) > 22:
-                options.append(
-                    self._convert(text, "primary") + f"\n{' ' * 24}{help_text}"
-                )
-            else:
-                options.append(
-                    self._convert(text, "primary") + f"{' ' * (24 - len(text))}{help_text}"
-                )
-        subcommands = []
-        for sub in (i for i in parts if isinstance(i, Subcommand)):
-            name = (f'{{{" ".join(sub.requires)}}} ' if sub.requires else "") + ", ".join(sorted(sub.aliases, key=len))
-            args = self.parameters(sub.args, show_notice=False)
-            text = f"  {name}{tuple(sub.separators)[0]}{args}"
-            help_text = sub.help_text
-            if len(help_text) + 24 > width:
-                _prts = [help_text[i:i + (width - 24)] for i in range(0, len(help_text), width - 24)]
-                help_text = f"\n{' ' * 24}".join(_prts)
-            if len(text) > 22:
-                subcommands.append(
-                    self._convert(text, "primary") + f"\n{' ' * 24}{help_text}"
-                )
-            else:
-                subcommands.append(
-                    self._convert(text, "primary") + f"{' ' * (24 - len(text))}{help_text}"
-                )
+        options, subcommands = self._columns(parts, lambda text: self._convert(text, "primary"))
         option_string = "\n".join(options)
         subcommand_string = "\n".join(subcommands)
         _opt = f"{lang.require('tools', 'format.ap.opt')}:"
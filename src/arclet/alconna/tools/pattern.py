@@ -1,9 +1,12 @@
 import inspect
 import re
-from typing import Any, Callable, Literal, Tuple, Type, TypeVar
+from typing import Any, Callable, List, Literal, Optional, Tuple, Type, TypeVar
 
 from arclet.alconna import Args
 from nepattern import (
+    ANY,
+    STRING,
+    AnyString,
     BasePattern,
     Empty,
     MatchMode,
@@ -15,6 +18,24 @@ from tarina import lang
 from .debug import analyse_args
 
 TOrigin = TypeVar("TOrigin")
+_Field = Tuple[str, BasePattern, Any, bool]
+
+
+def _compile_fields(args: Args) -> Optional[List[_Field]]:
+    """
+    将 Args 预编译为逐字段的 (名称, 模式, 默认值, 是否可选) 列表
+
+    若存在需要完整解析流程的参数 (如 MultiVar, KeyWordVar, AllParam 等), 则返回 None
+    """
+    argument = args.argument
+    if argument.unpack or argument.keyword_only or argument.vars_positional or argument.vars_keyword:
+        return None
+    fields = []
+    for arg in argument.normal:
+        if arg.value.alias == "*":
+            return None
+        fields.append((arg.name, arg.value, arg.field.default, arg.optional))
+    return fields
 
 
 class ObjectPattern(BasePattern[TOrigin, Any, Literal[MatchMode.TYPE_CONVERT]]):
@@ -87,6 +108,7 @@ class ObjectPattern(BasePattern[TOrigin, Any, Literal[MatchMode.TYPE_CONVERT]]):
             )
         else:
             raise TypeError(lang.require("tools", "pattern.flag_error").format(target=flag))
+        self._fields = _compile_fields(self._args)
         super().__init__(
             mode=MatchMode.TYPE_CONVERT, origin=origin, alias=origin.__name__
         )
@@ -99,6 +121,8 @@ class ObjectPattern(BasePattern[TOrigin, Any, Literal[MatchMode.TYPE_CONVERT]]):
             raise MatchFailed(lang.require("nepattern", "type_error").format(target=input_.__class__))
         if not (mat := self._re_pattern.fullmatch(input_)):
             raise MatchFailed(lang.require("nepattern", "content_error").format(target=input_))
+        if self._fields is not None:
+            return self.origin(**self._convert(mat.groupdict(), input_))
         if res := analyse_args(
             self._args, list(mat.groupdict().values()), raise_exception=False
         ):
@@ -106,6 +130,24 @@ class ObjectPattern(BasePattern[TOrigin, Any, Literal[MatchMode.TYPE_CONVERT]]):
         else:
             raise MatchFailed(lang.require("nepattern", "content_error").format(target=input_))
 
+    def _convert(self, groups: dict, input_: str) -> dict:
+        result = {}
+        for name, pat, default, optional in self._fields:  # type: ignore
+            value = groups[name]
+            if pat is ANY or pat is STRING:
+                result[name] = value
+                continue
+            if pat is AnyString:
+                result[name] = str(value)
+                continue
+            res = pat.validate(value, default)
+            if res.failed:
+                if optional:
+                    continue
+                raise MatchFailed(lang.require("nepattern", "content_error").format(target=input_))
+            result[name] = res._value  # noqa
+        return result
+
     def __call__(self, *args, **kwargs):
         return self.origin(*args, **kwargs)
 
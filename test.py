@@ -54,6 +54,163 @@ def test_koishi_like():
     assert con4.options[3].aliases == {"--foo4", "-F4"}
 
 
+def test_args_from_list_cache():
+    from src.arclet.alconna.tools.construct import args_from_list
+
+    class Digit(int):
+        pass
+
+    types = {"digit": Digit}
+    args1 = args_from_list([["foo", "str"], ["bar", "digit", "123"]], types)
+    args2 = args_from_list([[" foo ", "str"], ["bar", "digit", "123"]], types)
+    assert args1 == args2
+    assert args1.argument[1].value is args2.argument[1].value
+    assert args2.argument[1].field.default == 123
+    args3 = args_from_list([["bar", "digit", "123"]], {"digit": float})
+    assert args3.argument[0].value is not args1.argument[1].value
+    assert args_from_list([["baz", "int+"]], types).argument.vars_positional
+
+    class Level(int):
+        pass
+
+    types["digit"] = Level
+    assert args_from_list([["bar", "digit"]], types).argument[0].value.origin is Level
+    types["等级"] = Digit
+    assert args_from_list([["bar", "等级"]], types).argument[0].value.origin is Digit
+    # typing 中的名称优先于 custom_types, custom_types 优先于内置类型
+    assert str(args_from_list([["bar", "List[int]"]], {"List": Digit}).argument[0].value) == "list[int]"
+    assert args_from_list([["bar", "float"]], {"float": Digit}).argument[0].value.origin is float
+    assert args_from_list([["bar", "complex"]], {"complex": Digit}).argument[0].value.origin is Digit
+
+
+def test_args_type_expression():
+    from src.arclet.alconna.tools.construct import args_from_list
+
+    con_5 = Alconna("con_5", args_from_list([["mode", "Literal['r', 'w']"], ["count", "int|bool"]], {}))
+    assert con_5.parse("con_5 r 12").query("count") == 12
+    assert con_5.parse("con_5 x 12").matched is False
+    args = args_from_list([["extra", "Optional[List[int]]"], ["when", "datetime.date"]], {"datetime": __import__("datetime")})
+    assert [str(arg.value) for arg in args.argument] == ["list[int]|None", "date"]
+    called = []
+    args = args_from_list([["foo", "__import__('os').getcwd()"], ["bar", "called.append(1)"]], {"called": called})
+    assert not called
+    assert args.argument[1].value.target == "called.append(1)"
+
+    import pytest
+    from arclet.alconna.exceptions import InvalidArgs
+
+    args = args_from_list([["flag", "Literal[True, False]"], ["nums", "Tuple[int, ...]"], ["maybe", "Literal[1, None]"]], {})
+    assert [set(str(arg.value).split("|")) for arg in args.argument] == [{"True", "False"}, {"tuple[int]"}, {"1", "None"}]
+    litcmd = AlconnaString("litcmd <flag:Literal[True, False]>", types={}).build()
+    assert litcmd.parse(["litcmd", True]).query("flag") is True
+    # 无法解析的下标或联合表达式直接报错, 而不是变为永远无法匹配的字面量
+    with pytest.raises(InvalidArgs):
+        args_from_list([["foo", "List[Unknown]"]], {})
+    with pytest.raises(InvalidArgs):
+        args_from_list([["foo", "int | Unknown"]], {})
+    assert args_from_list([["foo", "bar"]], {}).argument[0].value.target == "bar"
+
+
+class _Level(int):
+    pass
+
+
+def test_koishi_like_types():
+    con_6 = AlconnaString("con_6 <lv:_Level>").option("max", "-m <lv:_Level>").build()
+    assert con_6.args.argument[0].value.origin is _Level
+    assert con_6.options[0].args.argument[0].value.origin is _Level
+
+    class Score(float):
+        pass
+
+    con_7 = AlconnaString("con_7 <s:Score>", types={"Score": Score}).option("min", "-m <s:Score>").build()
+    assert con_7.args.argument[0].value.origin is Score
+    assert con_7.options[0].args.argument[0].value.origin is Score
+
+
+def test_koishi_like_grammar():
+    import json
+    from src.arclet.alconna.tools.construct import parse_command_spec, parse_node_spec
+
+    spec = parse_command_spec("[!|/]con_8 <mode:Literal['r', 'w']> [extra:List[int]] #HELP")
+    assert json.loads(json.dumps(spec)) == spec
+    assert spec["prefixes"] == ["!", "/"]
+    assert spec["help"] == "HELP"
+    assert spec["args"][1] == {"name": "extra", "value": "List[int]", "optional": True}
+    node = parse_node_spec("--foo -f <foo:str=123> #foo help")
+    assert node["dest"] == "foo"
+    assert node["aliases"] == ["--foo", "--foo", "-f"]
+    assert node["help"] == "foo help"
+    con_8 = AlconnaString("[!|/]con_8 <mode:Literal['r', 'w']> [extra:List[int]] #HELP").build()
+    assert con_8.parse("!con_8 r [1,2]").query("extra") == [1, 2]
+    assert con_8.meta.description == "HELP"
+
+
+def test_spec_cache(tmp_path):
+    from src.arclet.alconna.tools import SpecCache
+
+    path = tmp_path / "commands.json"
+    cache = SpecCache(path)
+    builder = cache.string(
+        "con_9",
+        lambda: AlconnaString("[!]con_9 <count:int> #HELP").option("--foo -f <val:bool>", default={"val": False}),
+        "con_9 v1",
+    )
+    assert cache.dirty
+    cache.save()
+    con_9 = builder.build()
+
+    def fail():
+        raise AssertionError("should load from cache")
+
+    reloaded = SpecCache(path)
+    con_9_1 = reloaded.string("con_9", fail, "con_9 v1").build()
+    assert con_9_1.meta.description == "HELP"
+    assert con_9_1.parse("!con_9 12 -f True").query("val") is True
+    assert con_9_1.parse("!con_9 12").query("val") is False
+    assert con_9.parse("!con_9 12").matched
+    built = []
+    reloaded.string("con_9", lambda: built.append(1) or AlconnaString("con_9_2"), "con_9 v2")
+    assert built
+    con_1_3 = reloaded.format("con_1_3", "con_1_3 {target} --val {val:int}", {"target": str})
+    assert con_1_3.parse("con_1_3 Nameless --val 3").query("val") == 3
+
+
+def test_spec_cache_roundtrip(tmp_path):
+    import pytest
+    from arclet.alconna.action import append, store_true
+    from src.arclet.alconna.tools import SpecCache
+
+    def factory():
+        return (
+            AlconnaString("con_9_3 <count:int>")
+            .option("flag", "-F", default=False, action=store_true)
+            .option("tag", "-t <tag:str>", action=append)
+        )
+
+    path = tmp_path / "commands.json"
+    cache = SpecCache(path)
+    missed = cache.string("con_9_3", factory, "v1")
+    cache.save()
+    hit = SpecCache(path).string("con_9_3", lambda: pytest.fail("should load from cache"), "v1")
+    text = "con_9_3 1 -F -t a -t b"
+    for alc in (missed.build(), hit.build()):
+        res = alc.parse(text)
+        assert res.query("flag.value") is True
+        assert res.query("tag.tag") == ["a", "b"]
+        assert alc.parse("con_9_3 1").query("flag.value") is False
+
+    # 无法完整还原的定义不会写入缓存
+    with pytest.raises(ValueError):
+        AlconnaString("con_9_4").option("--foo", default=(1, 2)).to_spec()
+    cache.string("con_9_4", lambda: AlconnaString("con_9_4").option("--foo", default=(1, 2)), "v1")
+    cache.string("con_9_5", lambda: AlconnaString("con_9_5").alias("c95"), "v1")
+    assert "con_9_4" not in cache.entries and "con_9_5" not in cache.entries
+    # 被改动的定义视为过期
+    cache.entries["con_9_3"]["spec"]["command"] = "changed"
+    assert cache.get("con_9_3", cache.fingerprint("v1")) is None
+
+
 def test_format_like():
     con1 = AlconnaFormat("con1 {title:str} singer {name}")
     print('')
@@ -105,6 +262,167 @@ def test_fire_like_class():
     print(con2.instance)
 
 
+def test_fire_like_lazy():
+    class LazyClass:
+        def __init__(self, sender: Optional[str] = None):
+            self.sender = sender
+
+        def talk(self, name="world"):
+            return f"Hello {name} from {self.sender}"
+
+        def shout(self, word: int):
+            return word
+
+        class LazySub:
+            def __init__(self, name):
+                self.name = name
+
+            def output(self):
+                return self.name
+
+    con2_1 = AlconnaFire(LazyClass, lazy=True)
+    assert not {"talk", "shout", "LazySub"} & {opt.name for opt in con2_1.options}
+    assert con2_1.parse("LazyClass Alc talk hhh").matched is True
+    assert con2_1.get_result(LazyClass.talk) == "Hello hhh from Alc"
+    assert "shout" not in {opt.name for opt in con2_1.options}
+    assert con2_1.parse("LazyClass talk Friend LazySub abc output").query("LazySub.name") == "abc"
+    assert "shout" in con2_1.get_help()
+    assert not con2_1._pending
+
+
+def test_fire_like_lazy_batch(monkeypatch):
+    from types import ModuleType
+    from arclet.alconna import command_manager
+    from src.arclet.alconna.tools.construct import ModuleMounter
+
+    module = ModuleType("lazy_batch")
+    exec(
+        "\n".join(f"def func_{i}(a: int):\n    return a\n" for i in range(16))
+        + "\nclass Cls:\n    def go(self):\n        return 1\n    class Config:\n        command = 'cls|c'\n",
+        module.__dict__,
+    )
+    con2_4 = ModuleMounter(module, lazy=True)
+    updates = []
+    update = command_manager.update
+    monkeypatch.setattr(command_manager, "update", lambda cmd: updates.append(1) or update(cmd))
+    # 以别名命中成员, 回调以 dest 为键
+    assert con2_4.parse("lazy_batch c go").matched
+    assert con2_4.get_result(module.Cls.go) == 1
+    for i in range(16):
+        assert con2_4.parse(f"lazy_batch func_{i} {i}").matched
+    assert len(updates) <= 6
+    assert not con2_4._pending
+    command_manager.delete(con2_4)
+    # 紧凑形式同样命中成员
+    con2_5 = ModuleMounter(module, {"command": "lazy_batch_2"}, lazy=True)
+    assert con2_5._hits(["func_12=2", "cls", "other"]) == ["func_12", "cls|c"]
+
+
+def test_fire_like_nested():
+    class Outer:
+        def __init__(self, sender: str = "x"):
+            self.sender = sender
+
+        def talk(self, name="world"):
+            return f"talk {name}"
+
+        class Inner:
+            def __init__(self, name):
+                self.name = name
+
+            def output(self):
+                return f"inner {self.name}"
+
+            class Deep:
+                def __init__(self, value):
+                    self.value = value
+
+                def go(self):
+                    return f"deep {self.value}"
+
+                class Config:
+                    command = "deeper|d"
+
+    con2_2 = AlconnaFire(Outer)
+    assert con2_2.parse("Outer talk F Inner abc output deeper q go").matched
+    assert con2_2.get_result(Outer.Inner.Deep.go) == "deep q"
+    assert con2_2.get_result(Outer.talk) == "talk F"
+    assert con2_2.get_result(Outer.Inner.output) == "inner abc"
+    assert con2_2.get_result(Outer.Inner.Deep.go) == "deep q"
+    assert con2_2.parse("Outer Inner abc d q go").matched
+    assert con2_2.get_result(Outer.Inner.Deep.go) == "deep q"
+    assert con2_2.parse("Outer Inner abc output").matched
+    assert con2_2.get_result(Outer.talk) is None
+
+    # 替换已有的回调也会使索引过期
+    def loud(name="world"):
+        return f"TALK {name}"
+
+    con2_2.cb_behavior.options["options.talk.args"] = loud
+    assert con2_2.parse("Outer talk F").matched
+    assert con2_2.cb_behavior.results[loud.__qualname__] == "TALK F"
+
+
+def test_fire_like_invoke():
+    from concurrent.futures import ThreadPoolExecutor
+
+    class Echo:
+        def __init__(self, prefix: str = "p"):
+            self.prefix = prefix
+
+        def echo(self, x: int):
+            return x
+
+        def other(self, y: str):
+            return y
+
+        def tagged(self, x: int):
+            return f"{self.prefix}:{x}"
+
+    con2_3 = AlconnaFire(Echo)
+
+    def run(i: int):
+        if i % 3 == 0:
+            # parse 与 invoke 共用解析锁, 可以混合使用
+            return con2_3.parse(f"Echo echo {i}").query("echo.x")
+        res = con2_3.invoke(f"Echo echo {i}" if i % 2 else f"Echo other s{i}")
+        return res.get_result(Echo.echo if i % 2 else Echo.other)
+
+    with ThreadPoolExecutor(8) as pool:
+        expected = [i if i % 3 == 0 or i % 2 else f"s{i}" for i in range(300)]
+        assert list(pool.map(run, range(300))) == expected
+    con2_3.cb_behavior.results.clear()
+    res = con2_3.invoke("Echo echo 3")
+    assert res.matched
+    assert res.get_result(Echo.other) is None
+    assert con2_3.get_result(Echo.echo) is None
+
+    # 每次 invoke 独立构造实例, 方法读取的是本次调用的构造参数
+    def tagged(i: int):
+        return con2_3.invoke(f"Echo u{i} tagged {i}").get_result(Echo.tagged)
+
+    with ThreadPoolExecutor(8) as pool:
+        assert list(pool.map(tagged, range(200))) == [f"u{i}:{i}" for i in range(200)]
+    assert con2_3.args["prefix"].field.default == "p"
+
+    class Box:
+        def __init__(self, size: int = 1):
+            self.size = size
+
+        def area(self, k: int):
+            return self.size * k
+
+    box = Box()
+    con2_6 = AlconnaFire(box)
+
+    def area(i: int):
+        return con2_6.invoke(f"Box {i} area 2").get_result(Box.area)
+
+    with ThreadPoolExecutor(8) as pool:
+        assert list(pool.map(area, range(100))) == [i * 2 for i in range(100)]
+    assert box.size == 1
+
+
 def test_fire_like_object():
     class MyClass:
         def __init__(self, action=sum):
@@ -147,6 +465,45 @@ def test_fire_like_func():
 
 
 
+def test_visit_config_source(tmp_path):
+    import importlib.util
+    import os
+    from src.arclet.alconna.tools.construct import visit_config
+
+    path = tmp_path / "mounted.py"
+    path.write_text(
+        "def func():\n"
+        "    class Config:\n"
+        "        command = __import__('os').getcwd()\n"
+        "        prefixes = ['!', '/']\n"
+        "        description = 'mounted'\n"
+    )
+    spec = importlib.util.spec_from_file_location("mounted", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert visit_config(module.func) == {"prefixes": ["!", "/"], "description": "mounted"}
+    path.write_text(path.read_text().replace("'mounted'", "'changed'"))
+    os.utime(path, ns=(0, 10**9))
+    assert visit_config(module.func)["description"] == "changed"
+
+    from functools import wraps
+
+    def logged(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    @logged
+    def hi():
+        class Config:
+            command = "hi"
+            prefixes = ["!"]
+
+    assert visit_config(hi) == {"command": "hi", "prefixes": ["!"]}
+
+
 def test_delegate():
     @delegate
     class con5:
@@ -169,6 +526,178 @@ def test_click_like():
     assert hello("con6 --foo John --count 2").matched is True
 
 
+def test_executor_batch():
+    import asyncio
+
+    con6_1 = AlconnaDecorate()
+    called = []
+
+    @con6_1.command("con6_1")
+    @con6_1.option("--foo", Args["bar", int])
+    def hello(bar: int):
+        called.append(bar)
+
+    res = hello.batch([f"con6_1 --foo {i}" for i in range(5)] + ["con6_1 --foo abc"])
+    assert [r.matched for r in res] == [True] * 5 + [False]
+    assert called == list(range(5))
+
+    async def _main():
+        async def _gen():
+            for i in range(3):
+                yield f"con6_1 --foo {i}"
+
+        return [r.matched async for r in hello.abatch(_gen())]
+
+    called.clear()
+    assert asyncio.run(_main()) == [True] * 3
+    assert called == list(range(3))
+
+    # 不在事件循环中时所有 Executor 共享当前线程的备用循环
+    import os
+    from src.arclet.alconna.tools.construct import Executor, _get_loop
+
+    hello("con6_1 --foo 1")
+    fds = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else 0
+    for i in range(20):
+        Executor(hello.command, lambda bar: called.append(bar))(f"con6_1 --foo {i}")
+    assert (len(os.listdir("/proc/self/fd")) if fds else 0) <= fds
+    assert _get_loop() is _get_loop()
+
+
+def _square(num: int):
+    return num * num
+
+
+_process_cli = AlconnaDecorate()
+
+
+@_process_cli.command("con6_6")
+@_process_cli.option("--num", Args["num", int])
+def _cube(num: int):
+    return num ** 3
+
+
+def test_pool_parser():
+    import threading
+    import pytest
+    from src.arclet.alconna.tools import Executor, PoolParser
+
+    thread_parser = PoolParser.thread(2, max_pending=1, block=False)
+    con6_3 = AlconnaDecorate().set_default_parser(thread_parser)
+    event = threading.Event()
+
+    @con6_3.command("con6_3")
+    @con6_3.option("--foo", Args["bar", int])
+    def slow(bar: int):
+        event.wait(1)
+        return bar
+
+    res, fut = slow.execute("con6_3 --foo 1")
+    assert res.matched
+    _, busy = slow.execute("con6_3 --foo 2")
+    assert isinstance(busy.exception(), RuntimeError)
+    event.set()
+    assert fut.result() == 1
+    assert slow.execute("con6_3 --foo 3")[1].result() == 3
+    thread_parser.shutdown()
+
+    process_parser = PoolParser.process(1)
+    con6_4 = Alconna("con6_4", Args["num", int])
+    executor = Executor(con6_4, _square).set_parser(process_parser)
+    assert executor.execute("con6_4 12")[1].result() == 144
+    _cube.set_parser(process_parser)
+    assert _cube.execute("con6_6 --num 3")[1].result() == 27
+    with pytest.raises(TypeError):
+        Executor(con6_4, lambda num: num).set_parser(process_parser).execute("con6_4 1")
+    process_parser.shutdown()
+    with pytest.raises(RuntimeError):
+        executor.execute("con6_4 1")
+    assert process_parser._slots is None
+
+    import asyncio
+    import time
+
+    blocking_parser = PoolParser.thread(1, max_pending=1, timeout=1)
+    release = threading.Event()
+    ticks = []
+
+    def wait(num: int):
+        release.wait(1)
+        return num
+
+    waiter = Executor(con6_4, wait).set_parser(blocking_parser)
+
+    async def _main():
+        first = waiter.execute("con6_4 1")[1]
+        second = waiter.execute("con6_4 2")[1]
+        for _ in range(3):
+            ticks.append(1)
+            await asyncio.sleep(0.01)
+        release.set()
+        return await first, await second
+
+    start = time.perf_counter()
+    assert asyncio.run(_main()) == (1, 2)
+    assert len(ticks) == 3
+    assert time.perf_counter() - start < 0.5
+    blocking_parser.shutdown()
+    with pytest.raises(RuntimeError):
+        waiter.execute("con6_4 3")
+    assert blocking_parser._slots.acquire(False)
+
+
+def test_async_executor():
+    import asyncio
+    import threading
+    import time
+    from src.arclet.alconna.tools import AsyncExecutor, PoolParser
+
+    con6_2 = AlconnaDecorate()
+    running = []
+    peak = []
+
+    @con6_2.command("con6_2", concurrency=2)
+    @con6_2.option("--foo", Args["bar", int])
+    async def hello(bar: int):
+        running.append(bar)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(bar)
+        return bar
+
+    assert isinstance(hello, AsyncExecutor)
+
+    async def _main():
+        assert (await hello("con6_2 --foo 1")).matched
+        res = [r async for r in hello.abatch([f"con6_2 --foo {i}" for i in range(6)] + ["con6_2 --foo abc"])]
+        assert [r.matched for r in res] == [True] * 6 + [False]
+
+    asyncio.run(_main())
+    assert max(peak) == 2
+    peak.clear()
+    res = hello.batch([f"con6_2 --foo {i}" for i in range(4)])
+    assert [r.matched for r in res] == [True] * 4
+    assert max(peak) == 2
+
+    thread_parser = PoolParser.thread(4)
+    lock = threading.Lock()
+    running.clear()
+    peak.clear()
+
+    def pooled(bar: int):
+        with lock:
+            running.append(bar)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(bar)
+
+    pooled_async = AsyncExecutor(Alconna("con6_5", Args["bar", int]), pooled, 1).set_parser(thread_parser)
+    assert [r.matched for r in pooled_async.batch([f"con6_5 {i}" for i in range(4)])] == [True] * 4
+    assert max(peak) == 1
+    thread_parser.shutdown()
+
+
 def test_object_pattern():
     class A:
         def __init__(self, username: str, userid: int):
@@ -178,6 +707,67 @@ def test_object_pattern():
     pat11 = ObjectPattern(A, flag='urlget')
 
     assert pat11.validate("username=abcd&userid=123").success
+    assert pat11.match("username=abcd&userid=123").id == 123
+    assert pat11.validate("username=abcd&userid=abc").failed
+
+    class B:
+        def __init__(self, name: str, *tags: str):
+            self.name = name
+
+    pat12 = ObjectPattern(B, flag='part')
+    assert pat12._fields is not None
+    assert pat12.match("abcd").name == "abcd"
+
+
+def test_prepared_analyser():
+    from concurrent.futures import ThreadPoolExecutor
+    from arclet.alconna import Subcommand
+    from src.arclet.alconna.tools.debug import prepare
+
+    opt = prepare(Option("--foo", Args["bar", int]), raise_exception=False)
+    assert opt(["--foo", "123"]).args == {"bar": 123}
+    assert opt(["--foo", "abc"]) is None
+    sub = prepare(Subcommand("sub", Args["a", int], Option("--x")))
+    assert sub(["sub 1 --x"]).options["x"]
+    assert not sub(["sub 2"]).options
+    args = prepare(Args["a", int]["b", str], raise_exception=False)
+    assert args(["1", "x"]) == {"a": 1, "b": "x"}
+    assert args(["q", "x"]) == {}
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda i: opt(["--foo", str(i)]).args["bar"], range(200)))
+    assert results == list(range(200))
+
+
+def test_analyse_option_mutated():
+    import pytest
+    from src.arclet.alconna.tools.debug import _PreparedAnalyser, analyse_option
+
+    with pytest.raises(TypeError):
+        _PreparedAnalyser()  # type: ignore
+    node = Option("--foo", Args["bar", int])
+    assert analyse_option(node, ["--foo 1"]).args == {"bar": 1}
+    node.separate(":")
+    assert analyse_option(node, ["--foo:1"]).args == {"bar": 1}
+
+
+def test_analyse_option_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    from arclet.alconna import Subcommand
+    from src.arclet.alconna.tools.debug import analyse_option, analyse_subcommand
+
+    opts = [Option(f"--opt{i}", Args["val", int]) for i in range(4)]
+    sub = Subcommand("sub", Args["a", int])
+
+    def work(i: int):
+        opt = opts[i % 4]
+        res = analyse_option(opt, [f"--opt{i % 4}", str(i)])
+        assert res.args == {"val": i}
+        assert analyse_subcommand(sub, [f"sub {i}"]).args == {"a": i}
+        return i
+
+    with ThreadPoolExecutor(8) as pool:
+        assert list(pool.map(work, range(400))) == list(range(400))
 
 
 def test_checker():
@@ -196,6 +786,101 @@ def test_checker():
     assert test("foo") is None
 
 
+def test_checker_compiled():
+    import pytest
+    from arclet.alconna.exceptions import InvalidParam
+
+    @simple_type()
+    def add(a: int, b: float = 1.0):
+        return a + b
+
+    assert add("1", b="2.5") == 3.5
+    assert add(1) == 2.0
+    assert add() is None
+    assert add(1, 2, 3) is None
+    assert add(1, c=2) is None
+    assert add("x") is None
+
+    @simple_type(raise_exception=True)
+    def strict(a: int):
+        return a
+
+    with pytest.raises(InvalidParam):
+        strict("x")
+
+    def keep(a: int, b: str = "x"):
+        return a, b
+
+    # 传入的参数校验失败时不回退到默认值, 两条路径结果一致
+    assert simple_type()(keep)(1, "y") == simple_type(compiled=False)(keep)(1, "y") == (1, "y")
+    assert simple_type()(keep)(1, 2) is None
+    assert simple_type(compiled=False)(keep)(1, 2) is None
+
+    @simple_type()
+    def varargs(*nums: int):
+        return sum(nums)
+
+    assert varargs(1, "2") == 3
+    assert varargs(1, "x") is None
+
+    class Counter:
+        @simple_type()
+        def add(self, *nums: int, step: int = 1):
+            return sum(nums) * step
+
+    assert Counter().add("1", 2, step="3") == 9
+
+
+def test_checker_unregistered():
+    from arclet.alconna import command_manager
+
+    before = len(command_manager.get_commands())
+
+    @simple_type()
+    def plain(num: int):
+        return num
+
+    @simple_type()
+    def varargs(*nums: int):
+        return nums
+
+    assert plain("1") == 1
+    assert varargs("1", "2") == (1, 2)
+    assert len(command_manager.get_commands()) == before
+
+
+def test_checker_async():
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    @simple_type()
+    async def double(num: int):
+        await asyncio.sleep(0)
+        return num * 2
+
+    @simple_type(to_thread=True)
+    async def threaded(num: int):
+        return num
+
+    @simple_type(compiled=False)
+    async def parsed(num: int):
+        return num
+
+    async def main():
+        assert await double("21") == 42
+        assert await double("x") is None
+        assert await threaded("1") == 1
+        assert await parsed("2") == 2
+        with ThreadPoolExecutor(2) as pool:
+            @simple_type(to_thread=pool)
+            async def pooled(num: int):
+                return num
+
+            assert await pooled(3) == 3
+
+    asyncio.run(main())
+
+
 def test_exclusion():
     com2 = Alconna(
         "comp2",
@@ -208,6 +893,64 @@ def test_exclusion():
     assert com2.parse("comp2 foo bar").matched is False
 
 
+def test_inclusion_and_constraints():
+    from arclet.alconna import Subcommand
+    from src.arclet.alconna.tools import inclusion, constraints
+    from src.arclet.alconna.tools.actions import compile_path
+
+    alc = Alconna("comp_q", Option("foo", Args["x", int]), Option("bar"), Subcommand("sub", Args["y", int], Option("baz")))
+    arp = alc.parse("comp_q foo 1 sub 2")
+    for path in (
+        "foo", "bar", "x", "y", "options.foo", "options.foo.value", "options.foo.args", "options.foo.x",
+        "options.foo.args.x", "options.bar.x", "subcommands.sub", "subcommands.sub.args.y", "subcommands.sub.y",
+        "$main.x", "foo.x", "options",
+    ):
+        assert compile_path(path)(arp) == arp.query(path), path
+
+    com_any = Alconna("comp_any", Option("foo"), Option("bar"), behaviors=[inclusion("options.foo", "options.bar")])
+    assert com_any.parse("comp_any foo").matched is True
+    assert com_any.parse("comp_any").matched is False
+    com_all = Alconna(
+        "comp_all", Option("foo"), Option("bar"), behaviors=[inclusion("options.foo", "options.bar", flag="all")]
+    )
+    assert com_all.parse("comp_all foo").matched is False
+    assert com_all.parse("comp_all foo bar").matched is True
+
+    com_c = Alconna(
+        "comp_c", Option("foo"), Option("bar"), Option("baz"), Option("qux"),
+        behaviors=[constraints(exclude=[("foo", "bar")], include=["baz"], include_any=[("foo", "qux")])]
+    )
+    assert com_c.parse("comp_c foo baz").matched is True
+    assert com_c.parse("comp_c foo bar baz").matched is False
+    assert com_c.parse("comp_c qux").matched is False
+    assert com_c.parse("comp_c bar baz").matched is False
+    assert com_c.parse("comp_c qux baz").matched is True
+
+
+def test_constraint_set():
+    from arclet.alconna import Subcommand
+    from src.arclet.alconna.tools import constraint_set, ConstraintViolation
+
+    alc = Alconna(
+        "comp_cs", Option("--foo"), Option("--bar"), Option("--baz"), Option("--qux"), Subcommand("sub"),
+        behaviors=[
+            constraint_set(
+                requires=[("foo", "bar")],
+                conflicts=[("sub", ["baz", "options.qux"])],
+                at_most=[(1, ["baz", "qux"])],
+                exactly_one=[["bar", "sub"]],
+            )
+        ],
+    )
+    assert alc.parse("comp_cs --foo --bar").matched is True
+    assert alc.parse("comp_cs sub").matched is True
+    res = alc.parse("comp_cs --foo --baz --qux sub")
+    assert res.matched is False
+    assert isinstance(res.error_info, ConstraintViolation)
+    assert len(res.error_info.violations) == 3
+    assert alc.parse("comp_cs").matched is False
+
+
 def test_cooldown():
     import time
     com3 = Alconna("comp3", Args["bar", int], behaviors=[cool_down(0.3)])
@@ -216,6 +959,60 @@ def test_cooldown():
         time.sleep(0.2)
         print(com3.parse(f"comp3 {i}"))
 
+    com4 = Alconna("comp4", Args["bar", int], behaviors=[cool_down(60, scope="user")])
+    assert com4.parse("comp4 1", {"user": "a"}).matched is True
+    assert com4.parse("comp4 2", {"user": "b"}).matched is True
+    assert com4.parse("comp4 3", {"user": "a"}).matched is False
+
+    bounded = cool_down(60, scope=lambda arp: arp.query("bar"), max_keys=2)
+    com5 = Alconna("comp5", Args["bar", int], behaviors=[bounded])
+    for i in range(5):
+        assert com5.parse(f"comp5 {i}").matched is True
+    assert list(bounded.expires) == [3, 4]
+
+
+def test_rate_limit(tmp_path):
+    from src.arclet.alconna.tools import token_bucket, sliding_window, SQLiteStore
+
+    com6 = Alconna("comp6", Args["bar", int], behaviors=[token_bucket(10, 60, burst=3, scope="user")])
+    assert [com6.parse(f"comp6 {i}", {"user": "a"}).matched for i in range(4)] == [True, True, True, False]
+    assert com6.parse("comp6 4", {"user": "b"}).matched is True
+
+    com7 = Alconna("comp7", Args["bar", int], behaviors=[sliding_window(2, 60)])
+    assert [com7.parse(f"comp7 {i}").matched for i in range(3)] == [True, True, False]
+
+    # 两个限流器共享同一个 SQLite 文件, 模拟多个进程
+    left = token_bucket(2, 60, store=SQLiteStore(tmp_path / "limit.db"), name="shared")
+    right = token_bucket(2, 60, store=SQLiteStore(tmp_path / "limit.db"), name="shared")
+    com8 = Alconna("comp8", Args["bar", int], behaviors=[left])
+    com9 = Alconna("comp9", Args["bar", int], behaviors=[right])
+    assert com8.parse("comp8 1").matched is True
+    assert com9.parse("comp9 1").matched is True
+    assert com8.parse("comp8 2").matched is False
+
+    import sqlite3
+    import time
+    import pytest
+    from arclet.alconna.exceptions import OutBoundsBehave
+    from src.arclet.alconna.tools import RateLimitStore
+
+    with pytest.raises(TypeError):
+        RateLimitStore()  # type: ignore
+    # 过期的行会被删除, 数据库被锁定时解析失败而不是抛出异常
+    store = SQLiteStore(tmp_path / "evict.db", timeout=0.01, sweep_interval=0)
+    com10 = Alconna("comp10", Args["bar", int], behaviors=[token_bucket(20, 1, burst=1, scope="user", store=store)])
+    assert com10.parse("comp10 1", {"user": "a"}).matched is True
+    time.sleep(0.1)
+    assert com10.parse("comp10 2", {"user": "b"}).matched is True
+    assert store._connect().execute("SELECT COUNT(*) FROM rate_limit").fetchone()[0] == 1
+    locker = sqlite3.connect(tmp_path / "evict.db", isolation_level=None)
+    locker.execute("BEGIN EXCLUSIVE")
+    res = com10.parse("comp10 3", {"user": "c"})
+    assert res.matched is False
+    assert isinstance(res.error_info, OutBoundsBehave)
+    locker.execute("ROLLBACK")
+    assert com10.parse("comp10 4", {"user": "c"}).matched is True
+
 
 def test_formatter():
     from arclet.alconna import Alconna, Args, Option, Subcommand, CommandMeta
@@ -260,6 +1057,68 @@ def test_formatter():
     alc1.parse("!test2 bbb --help")
 
 
+def test_formatter_cache():
+    from arclet.alconna import Alconna, Option
+    from tarina import lang
+
+    alc = Alconna("test_cache", Option("--foo", help_text="foo"), formatter_type=ShellTextFormatter)
+    formatter = alc.formatter
+    first = alc.get_help()
+    assert alc.get_help() == first
+    assert formatter.cache_info()["hits"] == 1
+    alc.option("--bar", help_text="bar")
+    second = alc.get_help()
+    assert "--bar" in second
+    assert formatter.cache_info()["misses"] == 2
+    current = lang.current
+    lang.select("en-US" if current != "en-US" else "zh-CN")
+    try:
+        assert alc.get_help() != second
+    finally:
+        lang.select(current)
+    assert formatter.cache_info()["misses"] == 3
+
+
+def test_formatter_layout():
+    from arclet.alconna import Alconna, Option
+    from src.arclet.alconna.tools.formatter import display_width, layout_columns, wrap_text
+
+    assert display_width("abc") == 3
+    assert display_width("帮助文本") == 8
+    assert wrap_text("帮助文本帮助", 5) == ("帮助", "文本", "帮助")
+    assert wrap_text("abcdef\nxy", 4) == ("abcd", "ef", "xy")
+    assert layout_columns([("  -f", "中文说明")], 12, 8) == ["  -f    中文\n        说明"]
+    assert layout_columns([("  --long-name", "x")], 80, 8) == ["  --long-name\n        x"]
+
+    class WideShell(ShellTextFormatter):
+        column_width = 30
+
+    alc = Alconna("test_layout", Option("--foo", help_text="说明"), formatter_type=WideShell)
+    assert "  --foo" + " " * 23 + "说明" in alc.get_help()
+
+
+def test_formatter_resize(monkeypatch):
+    import os
+    import shutil
+    import signal
+    import pytest
+    from arclet.alconna import Alconna, Option
+    from src.arclet.alconna.tools.formatter import get_terminal_size
+
+    if not hasattr(signal, "SIGWINCH"):
+        pytest.skip("SIGWINCH is not available")
+    size = [os.terminal_size((80, 24))]
+    monkeypatch.setattr(shutil, "get_terminal_size", lambda fallback=(80, 24): size[0])
+    alc = Alconna("test_resize", Option("--foo", help_text="说明" * 20), formatter_type=ShellTextFormatter)
+    assert get_terminal_size(refresh=True) == 80
+    wide = alc.get_help()
+    size[0] = os.terminal_size((40, 24))
+    assert alc.get_help() == wide
+    signal.raise_signal(signal.SIGWINCH)
+    assert get_terminal_size() == 40
+    assert alc.get_help() != wide
+
+
 if __name__ == '__main__':
     import pytest
     pytest.main([__file__, "-vs"])
\ No newline at end of file